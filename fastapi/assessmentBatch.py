@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from config import settings
+from audioProcessor import process_audio_file
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def aggregate_scores(feedback: List[Optional[Dict]]) -> Dict:
+    """
+    Aggregate per-question feedback into assessment-level scores.
+    Mirrors calculateOverallStats / calculatePerformanceScores / calculateOverallScore in the frontend.
+    """
+    total_questions = max(1, len(feedback))
+    stats = {
+        "total_grammar_errors": 0,
+        "total_pronunciation_errors": 0,
+        "total_fluency_score": 0.0,
+        "total_filler_words": 0,
+        "fluency_count": 0,
+        "total_advanced_words": 0,
+        "total_relevance_score": 0.0,
+        "total_quality_score": 0.0,
+        "total_correctness_score": 0.0,
+        "correctness_count": 0,
+        "total_pauses": 0,
+        "pause_count": 0,
+    }
+    for question_feedback in feedback:
+        if not question_feedback or "error" in question_feedback:
+            continue
+        stats["total_grammar_errors"] += question_feedback.get("grammar", {}).get("error_count", 0)
+        stats["total_pronunciation_errors"] += question_feedback.get("pronunciation", {}).get("error_count", 0)
+        fluency = question_feedback.get("fluency")
+        if fluency:
+            stats["total_fluency_score"] += fluency.get("fluency_score", 0)
+            stats["total_filler_words"] += fluency.get("filler_word_count", 0)
+            stats["fluency_count"] += 1
+        vocabulary = question_feedback.get("vocabulary")
+        if vocabulary:
+            stats["total_advanced_words"] += vocabulary.get("total_advanced_words", 0)
+        correctness = question_feedback.get("correctness")
+        if correctness and "error" not in correctness:
+            stats["total_relevance_score"] += correctness.get("relevance_score", 0)
+            stats["total_quality_score"] += correctness.get("quality_score", 0)
+            stats["total_correctness_score"] += correctness.get("score", 0)
+            stats["correctness_count"] += 1
+        pauses = question_feedback.get("pauses")
+        if pauses and pauses.get("total_pauses") is not None:
+            stats["total_pauses"] += pauses["total_pauses"]
+            stats["pause_count"] += 1
+
+    grammar_performance = max(0, min(100, 100 - (stats["total_grammar_errors"] / total_questions * 5)))
+    pronunciation_performance = max(0, min(100, 100 - (stats["total_pronunciation_errors"] / total_questions * 5)))
+    fluency_performance = stats["total_fluency_score"] / stats["fluency_count"] if stats["fluency_count"] else 100
+    pause_performance = (
+        max(0, min(100, 100 - (stats["total_pauses"] / stats["pause_count"] * 10)))
+        if stats["pause_count"] else 100
+    )
+    correctness_performance = (
+        stats["total_correctness_score"] / stats["correctness_count"] if stats["correctness_count"] else 0
+    )
+
+    base_score = (
+        grammar_performance * 0.3 +
+        pronunciation_performance * 0.2 +
+        fluency_performance * 0.25 +
+        pause_performance * 0.25
+    )
+    correctness_impact = 0.3 + (correctness_performance / 100 * 0.3)
+
+    return {
+        "stats": stats,
+        "performance": {
+            "grammar": round(grammar_performance, 1),
+            "pronunciation": round(pronunciation_performance, 1),
+            "fluency": round(fluency_performance, 1),
+            "pauses": round(pause_performance, 1),
+            "correctness": round(correctness_performance, 1),
+        },
+        "overall_score": round(base_score * correctness_impact),
+    }
+
+async def score_assessment(items: List[Dict], language: str, feedback_processor) -> Dict:
+    """
+    Score every answer of an assessment session.
+
+    Each item has a "question" and either an "answer" transcript or an "audio_path"
+    (optionally with "audio_hash") to transcribe. All items start at once; separate
+    semaphores bound transcription and analysis, so question N+1 is transcribed while
+    question N is being analyzed.
+
+    Returns:
+        Dict: per-question results in input order plus aggregate scores
+    """
+    transcription_slots = asyncio.Semaphore(settings.BATCH_TRANSCRIPTION_CONCURRENCY)
+    analysis_slots = asyncio.Semaphore(settings.BATCH_ANALYSIS_CONCURRENCY)
+
+    async def score_item(index: int, item: Dict) -> Dict:
+        question = item.get("question")
+        text = item.get("answer")
+        audio_path = item.get("audio_path")
+        result = {"index": index, "question": question}
+
+        if not text and audio_path:
+            async with transcription_slots:
+                transcription = await process_audio_file(audio_path, language, audio_hash=item.get("audio_hash"))
+            if transcription.get("status") != "success":
+                result.update({"status": "error", "message": transcription.get("message", "Transcription failed")})
+                return result
+            text = transcription["text"]
+            result["audio_id"] = transcription.get("audio_id")
+
+        if not text:
+            result.update({"status": "error", "message": "No answer text or audio provided"})
+            return result
+
+        async with analysis_slots:
+            feedback = await feedback_processor.analyze_text(text=text, question=question, tempFileName=audio_path, language=language)
+
+        if "error" in feedback:
+            result.update({"status": "error", "message": feedback["error"], "text": text})
+        else:
+            result.update({"status": "success", "text": text, "feedback": feedback})
+        return result
+
+    results = await asyncio.gather(*(score_item(index, item) for index, item in enumerate(items)))
+    logger.info(f"Scored assessment with {len(items)} questions")
+
+    return {
+        "status": "success",
+        "results": results,
+        "aggregate": aggregate_scores([r.get("feedback") for r in results])
+    }
@@ -0,0 +1,69 @@
+import os
+import asyncio
+import logging
+from typing import Dict, Optional
+import numpy as np
+from config import settings
+from feedback.audio_utils import AudioBuffer, ENCODINGS, encode_audio, load_audio
+from feedback.get_pause import find_speech_intervals
+from feedback.process_pool import run_on_samples
+import profiler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whisper works at 16 kHz mono; anything more only makes the upload bigger
+TRANSCRIPTION_SAMPLE_RATE = 16000
+
+async def trim_silences(audio: AudioBuffer) -> AudioBuffer:
+    """Shorten leading, trailing and long internal silences (see find_speech_intervals)."""
+    intervals = await run_on_samples(
+        find_speech_intervals, audio.samples, audio.sample_rate,
+        max_pause_seconds=settings.TRANSCRIPTION_MAX_PAUSE_SECONDS,
+        margin_seconds=settings.TRANSCRIPTION_SILENCE_MARGIN_SECONDS
+    )
+    if not intervals:
+        return audio
+    samples = np.concatenate([audio.samples[start:end] for start, end in intervals])
+    return AudioBuffer(samples, audio.sample_rate, source=audio.source)
+
+async def prepare_for_transcription(file_path: str, encoding: str = settings.TRANSCRIPTION_ENCODING) -> Optional[Dict]:
+    """
+    Extract the audio track of an upload, downmix to 16 kHz mono, trim silences and re-encode it.
+
+    Args:
+        file_path (str): Path to the uploaded audio or video file
+        encoding (str): Key of audio_utils.ENCODINGS
+
+    Returns:
+        Dict: audio (trimmed AudioBuffer), file (name and bytes to send, or None when the
+        original upload is smaller) and stats (bytes and seconds before and after);
+        None if the upload cannot be decoded
+    """
+    audio = await load_audio(file_path, TRANSCRIPTION_SAMPLE_RATE)
+    if audio is None:
+        return None
+
+    trimmed = await trim_silences(audio)
+    data = await asyncio.to_thread(encode_audio, trimmed.samples, trimmed.sample_rate, encoding)
+
+    bytes_before = os.path.getsize(file_path)
+    name = os.path.splitext(os.path.basename(file_path))[0] + ENCODINGS[encoding][2]
+    stats = {
+        "encoding": encoding,
+        "bytes_before": bytes_before,
+        "bytes_after": min(len(data), bytes_before),
+        "seconds_before": round(audio.duration, 2),
+        "seconds_after": round(trimmed.duration, 2),
+    }
+    logger.info(
+        f"Prepared {file_path} for transcription: {bytes_before} -> {len(data)} bytes ({encoding}), "
+        f"{audio.duration:.1f}s -> {trimmed.duration:.1f}s"
+    )
+    profiler.annotate(**{f"preprocess_{key}": value for key, value in stats.items()})
+    return {
+        "audio": trimmed,
+        # Already compact uploads (e.g. short Opus recordings) are sent as they are
+        "file": (name, data) if len(data) < bytes_before else None,
+        "stats": stats,
+    }
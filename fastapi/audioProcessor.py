@@ -1,9 +1,19 @@
 import os
-from groq import Groq
+import re
+import time
+import asyncio
+import uuid
+import hashlib
 import logging
 from dotenv import load_dotenv
 from fastapi import UploadFile, HTTPException
-from typing import Dict
+from typing import Dict, Optional
+from config import settings
+from llmClient import transcribe, task_settings
+from chunkedTranscription import transcribe_in_segments
+from audioPreprocessing import prepare_for_transcription
+from metrics import track_stage
+from responseCache import LRUCache, ResponseCache, make_key
 
 # Load environment variables
 load_dotenv()
@@ -12,10 +22,19 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-groq = "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"
+# Size of the chunks read from an upload while it is written to disk and hashed
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-# Initialize the Groq client with API key from environment variable
-client = Groq(api_key = groq)
+# Audio handles are the generated file names inside UPLOAD_DIR
+AUDIO_ID_PATTERN = re.compile(r"[0-9a-f]{32}(\.[a-z0-9]{1,8})?")
+
+# When sweep_uploads last ran, so uploads do not each list UPLOAD_DIR
+_last_sweep = 0.0
+
+# Transcripts of recently seen recordings, keyed by content hash, language and prompt
+transcription_cache = ResponseCache(
+    LRUCache(settings.TRANSCRIPTION_CACHE_MAX_ENTRIES, settings.TRANSCRIPTION_CACHE_TTL_SECONDS)
+)
 
 # Language mapping for Whisper model
 LANGUAGE_CODES = {
@@ -58,13 +77,107 @@ PROMPTS = {
 
 }
 
-async def process_audio_file(file_path: str, language: str = "English") -> dict:
+def sweep_uploads(ttl_seconds: float = settings.UPLOAD_TTL_SECONDS) -> int:
+    """
+    Delete uploads older than ttl_seconds (by modification time), which expires their audio_id.
+
+    Returns:
+        int: Number of files deleted
+    """
+    global _last_sweep
+    _last_sweep = time.time()
+    if not os.path.isdir(settings.UPLOAD_DIR):
+        return 0
+    removed = 0
+    for entry in os.scandir(settings.UPLOAD_DIR):
+        if not entry.is_file() or not AUDIO_ID_PATTERN.fullmatch(entry.name):
+            continue
+        try:
+            if _last_sweep - entry.stat().st_mtime > ttl_seconds:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    if removed:
+        logger.info(f"Deleted {removed} expired uploads from {settings.UPLOAD_DIR}")
+    return removed
+
+def _write_chunk(buffer, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    buffer.write(chunk)
+
+def _remove_file(file_path: str) -> None:
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+async def save_upload(file: UploadFile, max_bytes: int = settings.MAX_UPLOAD_BYTES) -> Dict:
+    """
+    Stream an upload in chunks to a unique file under UPLOAD_DIR, hashing it on the way.
+    Uploads larger than max_bytes are rejected as soon as the limit is crossed. The file
+    (and its audio_id) is kept for UPLOAD_TTL_SECONDS; expired uploads are swept here.
+
+    Returns:
+        Dict: audio_id (handle for later requests), path, sha256 and size of the upload
+    """
+    # File system calls go through worker threads so large uploads do not stall the event loop
+    await asyncio.to_thread(os.makedirs, settings.UPLOAD_DIR, exist_ok=True)
+    if time.time() - _last_sweep >= settings.UPLOAD_SWEEP_INTERVAL_SECONDS:
+        await asyncio.to_thread(sweep_uploads)
+    extension = os.path.splitext(os.path.basename(file.filename or ""))[1].lower()
+    if not re.fullmatch(r"\.[a-z0-9]{1,8}", extension):
+        extension = ""
+    audio_id = f"{uuid.uuid4().hex}{extension}"
+    file_path = os.path.join(settings.UPLOAD_DIR, audio_id)
+
+    digest = hashlib.sha256()
+    size = 0
+    buffer = await asyncio.to_thread(open, file_path, "wb")
+    try:
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Upload exceeds the maximum size of {max_bytes} bytes"
+                    )
+                await asyncio.to_thread(_write_chunk, buffer, digest, chunk)
+        finally:
+            await asyncio.to_thread(buffer.close)
+    except BaseException:
+        # Never leave partial uploads behind
+        await asyncio.to_thread(_remove_file, file_path)
+        raise
+
+    logger.info(f"Saved upload {file.filename} as {file_path} ({size} bytes)")
+    return {
+        "audio_id": audio_id,
+        "path": file_path,
+        "sha256": digest.hexdigest(),
+        "size": size
+    }
+
+def resolve_audio_handle(audio_id: Optional[str]) -> Optional[str]:
+    """
+    Map an audio handle returned by save_upload back to its file under UPLOAD_DIR.
+    Returns None for anything else, including paths and handles that have expired.
+    """
+    if not audio_id or not AUDIO_ID_PATTERN.fullmatch(audio_id):
+        return None
+    file_path = os.path.join(settings.UPLOAD_DIR, audio_id)
+    return file_path if os.path.exists(file_path) else None
+
+async def process_audio_file(file_path: str, language: str = "English", audio_hash: Optional[str] = None) -> dict:
     """
     Process an audio file and return its transcription and fluency analysis.
     
     Args:
         file_path (str): Path to the audio file
         language (str): Language name (default: "English")
+        audio_hash (str): SHA-256 of the file contents, if already known
     
     Returns:
         dict: Dictionary containing transcription result, fluency analysis, and status
@@ -79,23 +192,56 @@ async def process_audio_file(file_path: str, language: str = "English") -> dict:
         language_code = LANGUAGE_CODES.get(language, "en")
         logger.info(f"Processing audio in {language} (code: {language_code})")
 
-        # Open and process the audio file
-        with open(file_path, "rb") as file:
-            transcription = client.audio.transcriptions.create(
-                file=(os.path.basename(file_path), file.read()),
-                model="whisper-large-v3",
-                prompt=PROMPTS.get(language) ,
-                response_format="json",
-                language=language_code,
-                temperature=0
-            )
+        prompt = PROMPTS.get(language)
+        audio_bytes = None
+        prepared = None
+        preprocessing = None
+        if audio_hash is None:
+            with open(file_path, "rb") as file:
+                audio_bytes = file.read()
+            audio_hash = hashlib.sha256(audio_bytes).hexdigest()
+
+        cache_key = make_key("transcription", task_settings("transcription")["model"], audio_hash, language_code, prompt)
+        text = await transcription_cache.get(cache_key)
+        if text is not None:
+            logger.info(f"Transcription cache hit for {os.path.basename(file_path)}")
+        else:
+            # 16 kHz mono, silences trimmed, compactly re-encoded
+            if settings.TRANSCRIPTION_PREPROCESS_ENABLED:
+                async with track_stage("preprocess"):
+                    prepared = await prepare_for_transcription(file_path)
+                if prepared is not None:
+                    preprocessing = prepared["stats"]
+
+            # Long recordings are transcribed as concurrent segments when enabled
+            if settings.TRANSCRIPTION_CHUNKING_ENABLED:
+                text = await transcribe_in_segments(
+                    file_path, language_code, prompt, audio=prepared["audio"] if prepared else None
+                )
+            if text is None:
+                if prepared is not None and prepared["file"] is not None:
+                    upload = prepared["file"]
+                else:
+                    # Open and process the audio file
+                    if audio_bytes is None:
+                        with open(file_path, "rb") as file:
+                            audio_bytes = file.read()
+                    upload = (os.path.basename(file_path), audio_bytes)
+                text = await transcribe(
+                    file=upload,
+                    language=language_code,
+                    prompt=prompt
+                )
+            await transcription_cache.set(cache_key, text)
 
         return {
             "status": "success",
-            "text": transcription.text,
+            "text": text,
+            "audio_id": os.path.basename(file_path),
             "filename": os.path.basename(file_path),
             "language": language,
-            "language_code": language_code
+            "language_code": language_code,
+            "preprocessing": preprocessing
         }
 
     except Exception as e:
@@ -106,31 +252,3 @@ async def process_audio_file(file_path: str, language: str = "English") -> dict:
             "filename": os.path.basename(file_path),
             "language": language
         }
-
-async def process_audio(audio_file: UploadFile) -> Dict:
-    try:
-        # Create temp_audio directory if it doesn't exist
-        os.makedirs("temp_audio", exist_ok=True)
-        
-        # Save the audio file
-        file_path = os.path.join("temp_audio", "question_0.mp4")
-        with open(file_path, "wb") as buffer:
-            content = await audio_file.read()
-            buffer.write(content)
-        
-        logger.info(f"Audio file saved to: {file_path}")
-        
-        # Process the audio file
-        transcription = client.audio.transcriptions.create(
-            file=(os.path.basename(file_path), open(file_path, "rb").read()),
-            model="whisper-large-v3",
-            prompt=PROMPTS.get("English") ,
-            response_format="json",
-            language="en",
-            temperature=0
-        )
-
-        return {"text": transcription.text}
-    except Exception as e:
-        logger.error(f"Error processing audio: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
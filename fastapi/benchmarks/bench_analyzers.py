@@ -0,0 +1,313 @@
+"""
+Benchmark suite for the feedback analyzers and LLM response parsers.
+
+Measures get_pause_count, convert_audio_to_wav, analyze_fluency, analyze_vocabulary,
+FeedbackProcessor._parse_grammar_response, IdealAnswerGenerator.parse_llm_response and
+extract_questions_from_text on synthetic audio and transcripts of increasing size, and
+writes the results as JSON so runs can be compared across releases. The analysis_rate
+suite compares pause detection speed and accuracy at several analysis sample rates, and
+the prosody suite reports analyze_prosody's cost per second of audio.
+
+Run from the fastapi directory:
+    python -m benchmarks.bench_analyzers --output bench.json
+    python -m benchmarks.bench_analyzers --quick --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+import soundfile as sf
+from benchmarks.synthetic import (
+    synthetic_speech, synthetic_transcript, grammar_response, ideal_answer_response,
+    questions_response, expected_pause_count
+)
+from feedback.get_pause import get_pause_count, get_pause_count_from_buffer
+from feedback.prosody import analyze_prosody
+from feedback.audio_utils import convert_audio_to_wav, resample
+from feedback.feedback_processor import FeedbackProcessor
+from feedback.vocab_check import analyze_vocabulary
+from feedback.ideal_answer import IdealAnswerGenerator
+from setupGeneration import extract_questions_from_text
+
+SCHEMA_VERSION = 1
+
+def measure(func: Callable, repeat: int, min_time: float) -> Dict:
+    """Time func with timeit: calls per sample chosen by autorange, best/median over repeat samples."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    samples = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+def audio_cases(tmp_dir: str, durations: List[float]) -> List[Dict]:
+    cases = []
+    for duration in durations:
+        samples, pauses = synthetic_speech(duration)
+        path = os.path.join(tmp_dir, f"speech_{int(duration)}s.wav")
+        sf.write(path, samples, 16000)
+        cases.append({"path": path, "duration": duration, "expected_pauses": expected_pause_count(pauses)})
+    return cases
+
+def bench_get_pause_count(cases: List[Dict], repeat: int, min_time: float) -> List[Dict]:
+    results = []
+    for case in cases:
+        for method in ("vectorized", "loop"):
+            output = get_pause_count(case["path"], method=method)
+            results.append({
+                "name": "get_pause_count",
+                "params": {"duration_s": case["duration"], "method": method},
+                "checks": {"total_pauses": output.get("total_pauses"), "expected_pauses": case["expected_pauses"]},
+                **measure(lambda: get_pause_count(case["path"], method=method), repeat, min_time),
+            })
+    return results
+
+def boundary_error(detected: List[Dict], pauses: List[Tuple[float, float]], threshold_seconds: float = 0.8) -> Optional[float]:
+    """Mean absolute start/end error in seconds of each inserted pause against the detected pause overlapping it most."""
+    errors = []
+    for start, end in pauses:
+        if end - start < threshold_seconds:
+            continue
+        overlaps = [(min(end, p["end"]) - max(start, p["start"]), p) for p in detected]
+        overlap, best = max(overlaps, key=lambda item: item[0], default=(0, None))
+        if best is not None and overlap > 0:
+            errors.extend([abs(best["start"] - start), abs(best["end"] - end)])
+    return statistics.fmean(errors) if errors else None
+
+def bench_analysis_rate(durations: List[float], rates: List[int], repeat: int, min_time: float,
+                        source_rate: int = 48000) -> List[Dict]:
+    """Pause detection on a browser-rate recording resampled to each analysis rate: time and accuracy."""
+    results = []
+    for duration in durations:
+        samples, pauses = synthetic_speech(duration, sample_rate=source_rate)
+        reference = get_pause_count_from_buffer(samples, source_rate)
+        for rate in rates:
+            resampled = resample(samples, source_rate, rate)
+            output = get_pause_count_from_buffer(resampled, rate)
+            analysis = measure(lambda: get_pause_count_from_buffer(resampled, rate), repeat, min_time)
+            results.append({
+                "name": "analysis_rate",
+                "params": {"duration_s": duration, "sample_rate": rate, "source_rate": source_rate},
+                "checks": {
+                    "total_pauses": output["total_pauses"],
+                    "expected_pauses": expected_pause_count(pauses),
+                    "source_rate_pauses": reference["total_pauses"],
+                    "boundary_error_s": boundary_error(output["pause_details"], pauses),
+                },
+                "resample_min_s": measure(lambda: resample(samples, source_rate, rate), repeat, min_time)["min_s"],
+                "analysis_min_s": analysis["min_s"],
+                **analysis,
+            })
+    return results
+
+def bench_prosody(durations: List[float], repeat: int, min_time: float, words_per_minute: int = 150) -> List[Dict]:
+    """analyze_prosody on 16 kHz speech: time per second of audio, and its pauses (edge silences excluded) against pause detection."""
+    results = []
+    for duration in durations:
+        samples, _ = synthetic_speech(duration)
+        word_count = int(duration * words_per_minute / 60)
+        output = analyze_prosody(samples, 16000, word_count)
+        pauses = get_pause_count_from_buffer(samples, 16000)
+        timing = measure(lambda: analyze_prosody(samples, 16000, word_count), repeat, min_time)
+        results.append({
+            "name": "prosody",
+            "params": {"duration_s": duration},
+            "checks": {
+                "inner_pause_s": round(output["speaking_time"] - output["articulation_time"], 2),
+                "pause_detection_s": pauses["total_pause_duration"],
+                "voiced_ratio": output["voiced_ratio"],
+                "score": output["score"],
+            },
+            "ms_per_audio_s": round(timing["min_s"] * 1000 / duration, 3),
+            **timing,
+        })
+    return results
+
+def bench_convert_audio_to_wav(cases: List[Dict], tmp_dir: str, repeat: int, min_time: float) -> List[Dict]:
+    if not shutil.which("ffmpeg"):
+        return [{"name": "convert_audio_to_wav", "skipped": "ffmpeg not found"}]
+
+    results = []
+    loop = asyncio.new_event_loop()
+    try:
+        for case in cases:
+            source = os.path.join(tmp_dir, f"speech_{int(case['duration'])}s.mp3")
+            subprocess.run(["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", case["path"], source], check=True)
+            results.append({
+                "name": "convert_audio_to_wav",
+                "params": {"duration_s": case["duration"], "input": "mp3"},
+                **measure(lambda: loop.run_until_complete(convert_audio_to_wav(source)), repeat, min_time),
+            })
+    finally:
+        loop.close()
+    return results
+
+def bench_text_analyzers(word_counts: List[int], repeat: int, min_time: float) -> List[Dict]:
+    processor = FeedbackProcessor()
+    results = []
+    for word_count in word_counts:
+        text = synthetic_transcript(word_count)
+        results.append({
+            "name": "analyze_fluency",
+            "params": {"words": word_count},
+            "checks": {"filler_word_count": processor.analyze_fluency(text)["filler_word_count"]},
+            **measure(lambda: processor.analyze_fluency(text), repeat, min_time),
+        })
+        results.append({
+            "name": "analyze_vocabulary",
+            "params": {"words": word_count},
+            "checks": {"total_advanced_words": analyze_vocabulary(text)["total_advanced_words"]},
+            **measure(lambda: analyze_vocabulary(text), repeat, min_time),
+        })
+    return results
+
+def bench_parsers(error_counts: List[int], answer_lengths: List[int], question_counts: List[int],
+                  repeat: int, min_time: float) -> List[Dict]:
+    processor = FeedbackProcessor()
+    results = []
+    for error_count in error_counts:
+        for style in ("json", "fenced", "prose"):
+            response = grammar_response(error_count, style)
+            results.append({
+                "name": "_parse_grammar_response",
+                "params": {"errors": error_count, "style": style},
+                "checks": {"error_count": processor._parse_grammar_response(response)["error_count"]},
+                **measure(lambda: processor._parse_grammar_response(response), repeat, min_time),
+            })
+    for word_count in answer_lengths:
+        for wrapped in (False, True):
+            response = ideal_answer_response(word_count, wrapped)
+            results.append({
+                "name": "parse_llm_response",
+                "params": {"words": word_count, "wrapped": wrapped},
+                **measure(lambda: IdealAnswerGenerator.parse_llm_response(response), repeat, min_time),
+            })
+    for count in question_counts:
+        response = questions_response(count)
+        results.append({
+            "name": "extract_questions_from_text",
+            "params": {"questions": count},
+            "checks": {"extracted": len(extract_questions_from_text(response, count))},
+            **measure(lambda: extract_questions_from_text(response, count), repeat, min_time),
+        })
+    return results
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    import numpy
+    import librosa
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "librosa": librosa.__version__,
+        "ffmpeg": bool(shutil.which("ffmpeg")),
+    }
+
+def run_suite(quick: bool = False, only: Optional[str] = None) -> Dict:
+    repeat = 3 if quick else 5
+    min_time = 0.05 if quick else 0.2
+    durations = [5.0, 30.0] if quick else [5.0, 30.0, 120.0]
+    word_counts = [50, 500] if quick else [50, 500, 5000]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cases = audio_cases(tmp_dir, durations)
+        suites = {
+            "get_pause_count": lambda: bench_get_pause_count(cases, repeat, min_time),
+            "convert_audio_to_wav": lambda: bench_convert_audio_to_wav(cases, tmp_dir, repeat, min_time),
+            "text_analyzers": lambda: bench_text_analyzers(word_counts, repeat, min_time),
+            "parsers": lambda: bench_parsers([0, 5, 50], [50, 500], [5, 50], repeat, min_time),
+            "analysis_rate": lambda: bench_analysis_rate(durations, [8000, 16000, 22050, 48000], repeat, min_time),
+            "prosody": lambda: bench_prosody(durations, repeat, min_time),
+        }
+        results = []
+        for name, suite in suites.items():
+            if only and only not in name:
+                continue
+            print(f"running {name}...", file=sys.stderr)
+            results.extend(suite())
+
+    return {"schema_version": SCHEMA_VERSION, "environment": environment(), "results": results}
+
+def result_key(result: Dict) -> str:
+    return f"{result['name']} {json.dumps(result.get('params', {}), sort_keys=True)}"
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Cases whose min time grew by more than threshold (a fraction) against the baseline."""
+    previous = {result_key(r): r for r in baseline.get("results", []) if "min_s" in r}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(result_key(result))
+        if old and "min_s" in result and result["min_s"] > old["min_s"] * (1 + threshold):
+            regressions.append({
+                "case": result_key(result),
+                "baseline_min_s": old["min_s"],
+                "current_min_s": result["min_s"],
+                "ratio": result["min_s"] / old["min_s"],
+            })
+    return regressions
+
+def print_table(report: Dict) -> None:
+    for result in report["results"]:
+        params = ", ".join(f"{k}={v}" for k, v in result.get("params", {}).items())
+        if "skipped" in result:
+            print(f"{result['name']:<28} {'skipped: ' + result['skipped']}", file=sys.stderr)
+        else:
+            print(f"{result['name']:<28} {params:<40} {result['min_s'] * 1e6:>12.1f} us", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and repeats")
+    parser.add_argument("--only", help="run only suites whose name contains this")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    # Parser fallbacks log warnings; keep them out of the timings and the report
+    logging.disable(logging.CRITICAL)
+    report = run_suite(quick=args.quick, only=args.only)
+    print_table(report)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            report["regressions"] = compare(report, json.load(f), args.threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['case']}: x{regression['ratio']:.2f}", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
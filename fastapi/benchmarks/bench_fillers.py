@@ -0,0 +1,58 @@
+"""
+Micro-benchmark for filler-word detection.
+
+Compares the previous per-call regex build with the precompiled per-language
+matchers in feedback/fillers.py on transcripts of increasing length.
+
+Run from the fastapi directory:
+    python -m benchmarks.bench_fillers
+"""
+import re
+import random
+import timeit
+from feedback.fillers import ENGLISH_FILLER_PATTERNS, HESITATION_MARKERS, find_fillers
+
+WORDS = (
+    "i think the main reason is that people want to learn new skills and "
+    "technology helps them do it faster at the end of the day we all need practice"
+).split()
+FILLERS = ["um", "uh", "like", "you know", "basically", "hmm", "so", "actually"]
+
+def legacy_find_fillers(text: str) -> list:
+    """Previous analyze_fluency behaviour: join and compile the patterns on every call."""
+    combined_pattern = '|'.join(list(ENGLISH_FILLER_PATTERNS))
+    return [
+        {
+            "word": match.group(),
+            "position": match.start(),
+            "context": text[max(0, match.start()-20):min(len(text), match.end()+20)]
+        }
+        for match in re.finditer(combined_pattern, text.lower())
+    ]
+
+def synthetic_transcript(word_count: int, words=WORDS, fillers=FILLERS, filler_rate=0.08, seed=0) -> str:
+    rng = random.Random(seed)
+    tokens = []
+    for _ in range(word_count):
+        tokens.append(rng.choice(fillers) if rng.random() < filler_rate else rng.choice(words))
+    return " ".join(tokens)
+
+def main():
+    print(f"{'language':<10} {'words':>7} {'legacy us/call':>15} {'compiled us/call':>17} {'fillers':>8}")
+    for word_count in (100, 1000, 5000, 20000):
+        text = synthetic_transcript(word_count)
+        assert legacy_find_fillers(text) == find_fillers(text, "English")
+        number = max(3, 20000 // word_count)
+        legacy = min(timeit.repeat(lambda: legacy_find_fillers(text), number=number, repeat=3)) / number
+        compiled = min(timeit.repeat(lambda: find_fillers(text, "English"), number=number, repeat=3)) / number
+        print(f"{'English':<10} {word_count:>7} {legacy * 1e6:>15.1f} {compiled * 1e6:>17.1f} {len(find_fillers(text)):>8}")
+
+    hindi_words = "मुझे लगता है कि तकनीक हमारे जीवन को आसान बनाती है और हम रोज़ नई चीज़ें सीखते हैं".split()
+    for word_count in (100, 1000, 5000, 20000):
+        text = synthetic_transcript(word_count, words=hindi_words, fillers=HESITATION_MARKERS["Hindi"])
+        number = max(3, 20000 // word_count)
+        compiled = min(timeit.repeat(lambda: find_fillers(text, "Hindi"), number=number, repeat=3)) / number
+        print(f"{'Hindi':<10} {word_count:>7} {'-':>15} {compiled * 1e6:>17.1f} {len(find_fillers(text, 'Hindi')):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Synthetic inputs for the benchmarks: speech-like audio, transcripts and LLM responses.
+
+Everything is generated from a seed, so runs on different machines and releases
+measure the same inputs.
+"""
+import json
+import random
+from typing import List, Tuple
+import numpy as np
+
+WORDS = (
+    "i think the main reason is that people want to learn new skills and "
+    "technology helps them do it faster at the end of the day we all need practice"
+).split()
+FILLERS = ["um", "uh", "like", "you know", "basically", "hmm", "so", "actually"]
+ADVANCED_WORDS = ["consequently", "comprehensive", "innovative", "meticulous", "sustainable", "pivotal"]
+
+def synthetic_speech(duration: float, sample_rate: int = 16000, pause_every: float = 3.0,
+                     pause_length: float = 1.0, seed: int = 0) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+    """
+    Tone bursts at speech-like pitches separated by controlled silences.
+
+    Returns:
+        Tuple: (float32 samples, list of (start, end) seconds of every inserted pause)
+    """
+    rng = np.random.default_rng(seed)
+    segments, pauses = [], []
+    position = 0.0
+    while position < duration:
+        speech = min(rng.uniform(0.5, 1.5) * pause_every, duration - position)
+        t = np.arange(int(speech * sample_rate)) / sample_rate
+        pitch = rng.uniform(100, 300)
+        # Syllable-rate amplitude modulation keeps the envelope from being a flat tone
+        envelope = 0.3 + 0.2 * np.sin(2 * np.pi * rng.uniform(3, 6) * t)
+        segments.append((envelope * np.sin(2 * np.pi * pitch * t)).astype(np.float32))
+        position += speech
+        if position >= duration:
+            break
+        silence = min(rng.uniform(0.5, 1.5) * pause_length, duration - position)
+        segments.append(np.zeros(int(silence * sample_rate), dtype=np.float32))
+        pauses.append((position, position + silence))
+        position += silence
+    return np.concatenate(segments), pauses
+
+def synthetic_transcript(word_count: int, words=WORDS, fillers=FILLERS, filler_rate=0.08,
+                         advanced_rate=0.02, seed=0) -> str:
+    rng = random.Random(seed)
+    tokens = []
+    for _ in range(word_count):
+        roll = rng.random()
+        if roll < filler_rate:
+            tokens.append(rng.choice(fillers))
+        elif roll < filler_rate + advanced_rate:
+            tokens.append(rng.choice(ADVANCED_WORDS))
+        else:
+            tokens.append(rng.choice(words))
+    return " ".join(tokens)
+
+def grammar_response(error_count: int, style: str = "json", seed: int = 0) -> str:
+    """An analyze_grammar LLM response: plain "json", "fenced" in a code block, or wrapped in "prose"."""
+    rng = random.Random(seed)
+    errors = [
+        {
+            "word": f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+            "suggestion": f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+            "explanation": "Subject-verb agreement: the verb must agree with a singular subject."
+        }
+        for _ in range(error_count)
+    ]
+    body = json.dumps({"error_count": error_count, "errors": errors}, indent=4)
+    if style == "fenced":
+        return f"```json\n{body}\n```"
+    if style == "prose":
+        return f"Here is the grammar analysis you asked for:\n{body}\nLet me know if you need anything else."
+    return body
+
+def ideal_answer_response(word_count: int, wrapped: bool = False, seed: int = 0) -> str:
+    """An IdealAnswerGenerator LLM response, optionally wrapped in surrounding text."""
+    body = json.dumps({
+        "ideal_answer": synthetic_transcript(word_count, filler_rate=0, seed=seed),
+        "user_strengths": synthetic_transcript(word_count // 4, filler_rate=0, seed=seed + 1),
+        "areas_for_improvement": synthetic_transcript(word_count // 4, filler_rate=0, seed=seed + 2),
+    }, ensure_ascii=False)
+    return f"Sure! Here is the analysis:\n{body}\nHope this helps." if wrapped else body
+
+def questions_response(count: int, seed: int = 0) -> str:
+    """A question-generation LLM response mixing the numbering styles the parser handles."""
+    rng = random.Random(seed)
+    formats = ["{n}. {q}", "{n}) {q}", "Q{n}: {q}", "[{n}] {q}", "Question {n}: {q}"]
+    lines = []
+    for n in range(1, count + 1):
+        question = synthetic_transcript(rng.randint(8, 20), filler_rate=0, seed=seed + n).capitalize() + "?"
+        lines.append(rng.choice(formats).format(n=n, q=question))
+    return "```\n" + "\n\n".join(lines) + "\n```"
+
+def expected_pause_count(pauses: List[Tuple[float, float]], threshold_seconds: float = 0.8) -> int:
+    return sum(1 for start, end in pauses if end - start >= threshold_seconds)
@@ -0,0 +1,127 @@
+import os
+import re
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from config import settings
+from llmClient import transcribe
+from feedback.audio_utils import AudioBuffer, ENCODINGS, encode_audio, load_audio
+from feedback.get_pause import get_pause_count_from_buffer
+from feedback.process_pool import run_on_samples
+from audioPreprocessing import TRANSCRIPTION_SAMPLE_RATE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Words compared when removing text repeated by the overlap at a forced cut
+MAX_OVERLAP_WORDS = 8
+
+def plan_segments(
+    duration: float,
+    pauses: List[Dict],
+    target_seconds: float = settings.TRANSCRIPTION_CHUNK_TARGET_SECONDS,
+    max_seconds: float = settings.TRANSCRIPTION_CHUNK_MAX_SECONDS,
+) -> List[Tuple[float, float, bool]]:
+    """
+    Cut a recording into segments at the middle of its pauses.
+
+    Each cut is the pause closest to target_seconds after the previous cut, keeping
+    segments between half the target and max_seconds long. Where speech runs longer
+    than max_seconds without a pause, the segment is cut at target_seconds regardless.
+
+    Returns:
+        List of (start, end, forced) in seconds, where forced marks a segment whose end
+        is not at a pause
+    """
+    cuts = sorted((pause["start"] + pause["end"]) / 2 for pause in pauses)
+    segments = []
+    start = 0.0
+    while duration - start > target_seconds:
+        candidates = [
+            cut for cut in cuts
+            if start + target_seconds / 2 <= cut <= min(start + max_seconds, duration - target_seconds / 2)
+        ]
+        if candidates:
+            end, forced = min(candidates, key=lambda cut: abs(cut - start - target_seconds)), False
+        elif duration - start > max_seconds:
+            end, forced = start + target_seconds, True
+        else:
+            break
+        segments.append((start, end, forced))
+        start = end
+    segments.append((start, duration, False))
+    return segments
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+def _overlapping_words(previous: List[str], following: List[str]) -> int:
+    """Length of the longest run of words ending previous that also starts following."""
+    for count in range(min(MAX_OVERLAP_WORDS, len(previous), len(following)), 0, -1):
+        if [_normalize_word(w) for w in previous[-count:]] == [_normalize_word(w) for w in following[:count]]:
+            return count
+    return 0
+
+def stitch_transcripts(texts: List[str], forced: List[bool]) -> str:
+    """
+    Join segment transcripts in order. After a forced cut the overlap may have been
+    transcribed twice, so words repeated across that boundary are dropped once.
+    """
+    stitched: List[str] = []
+    for i, text in enumerate(texts):
+        words = text.split()
+        if i > 0 and forced[i - 1]:
+            words = words[_overlapping_words(stitched, words):]
+        stitched.extend(words)
+    return " ".join(stitched)
+
+async def transcribe_in_segments(file_path: str, language_code: str, prompt: Optional[str], audio: Optional[AudioBuffer] = None) -> Optional[str]:
+    """
+    Transcribe a long recording as concurrent segments cut at its pauses.
+
+    Args:
+        file_path (str): Path to the audio file
+        language_code (str): ISO language code
+        prompt (str): Prompt sent with every segment
+        audio (AudioBuffer): The recording already decoded at 16 kHz (e.g. silence-trimmed); decoded from file_path if not given
+
+    Returns:
+        str: Stitched transcript, or None when the recording is too short to split, cannot be
+        decoded or a segment fails, so the caller transcribes the whole file instead
+    """
+    if audio is None:
+        audio = await load_audio(file_path, TRANSCRIPTION_SAMPLE_RATE)
+    if audio is None or audio.duration < settings.TRANSCRIPTION_CHUNK_MIN_SECONDS:
+        return None
+
+    pauses = await run_on_samples(
+        get_pause_count_from_buffer, audio.samples, audio.sample_rate,
+        threshold_seconds=settings.TRANSCRIPTION_CHUNK_MIN_PAUSE_SECONDS
+    )
+    segments = plan_segments(audio.duration, pauses["pause_details"])
+    if len(segments) < 2:
+        return None
+
+    overlap = settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+    slots = asyncio.Semaphore(max(1, settings.TRANSCRIPTION_CHUNK_CONCURRENCY))
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    encoding = settings.TRANSCRIPTION_ENCODING
+
+    async def transcribe_segment(index: int, start: float, end: float) -> str:
+        first = int(max(0.0, start - overlap) * audio.sample_rate)
+        last = int(min(audio.duration, end + overlap) * audio.sample_rate)
+        async with slots:
+            data = await asyncio.to_thread(encode_audio, audio.samples[first:last], audio.sample_rate, encoding)
+            return await transcribe(file=(f"{name}_{index}{ENCODINGS[encoding][2]}", data), language=language_code, prompt=prompt)
+
+    tasks = [asyncio.create_task(transcribe_segment(i, start, end)) for i, (start, end, _) in enumerate(segments)]
+    try:
+        texts = await asyncio.gather(*tasks)
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        logger.error(f"Segmented transcription of {file_path} failed, transcribing it whole: {e}")
+        return None
+
+    logger.info(f"Transcribed {audio.duration:.1f}s of {file_path} as {len(segments)} segments")
+    return stitch_transcripts(list(texts), [forced for _, _, forced in segments])
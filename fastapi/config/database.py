@@ -1,4 +1,4 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from metrics import observe_stage
 from dotenv import load_dotenv
 import os
 import logging
@@ -11,12 +11,39 @@ logger = logging.getLogger(__name__)
 
 MONGODB_URL = os.getenv("MONGODB_URI")
 
-client = AsyncIOMotorClient(MONGODB_URL)
-db = client.fastapi_db
+# Created on first use, so importing the app does not pay for importing motor and pymongo
+_client = None
+
+def _metrics_listener():
+    from pymongo import monitoring
+
+    class MongoMetricsListener(monitoring.CommandListener):
+        """Record every MongoDB command as a "mongo_<command>" stage in /metrics."""
+
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            observe_stage(f"mongo_{event.command_name}", event.duration_micros / 1e6, "success")
+
+        def failed(self, event):
+            observe_stage(f"mongo_{event.command_name}", event.duration_micros / 1e6, "error")
+
+    return MongoMetricsListener()
+
+def get_client():
+    global _client
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        _client = AsyncIOMotorClient(MONGODB_URL, event_listeners=[_metrics_listener()])
+    return _client
+
+def get_db():
+    return get_client().fastapi_db
 
 async def init_db():
     try:
-        await client.admin.command('ping')
+        await get_client().admin.command('ping')
         logger.info("Successfully connected to MongoDB")
     except Exception as e:
         logger.error(f"Error connecting to MongoDB: {e}")
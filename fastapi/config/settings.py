@@ -0,0 +1,151 @@
+from dotenv import load_dotenv
+import os
+
+# Load environment variables
+load_dotenv()
+
+# Groq credentials
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Connection pool for the shared LLM / transcription client
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+# Overall deadline for the concurrent analyzer fan-out in analyze_text
+ANALYSIS_TIMEOUT_SECONDS = float(os.getenv("ANALYSIS_TIMEOUT_SECONDS", "30"))
+
+DEFAULT_CHAT_MODEL = os.getenv("LLM_CHAT_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct")
+DEFAULT_TRANSCRIPTION_MODEL = os.getenv("LLM_TRANSCRIPTION_MODEL", "whisper-large-v3")
+
+
+def _task(name: str, model: str, temperature: float, **extra) -> dict:
+    """Model settings for one call site, overridable with LLM_<NAME>_MODEL / LLM_<NAME>_TEMPERATURE."""
+    prefix = f"LLM_{name.upper()}_"
+    return {
+        "model": os.getenv(prefix + "MODEL", model),
+        "temperature": float(os.getenv(prefix + "TEMPERATURE", temperature)),
+        **extra,
+    }
+
+
+# Model and sampling settings for every LLM call site
+LLM_TASKS = {
+    "default": _task("default", DEFAULT_CHAT_MODEL, 0.1),
+    "grammar": _task("grammar", DEFAULT_CHAT_MODEL, 0.1),
+    "correctness": _task("correctness", DEFAULT_CHAT_MODEL, 0.3),
+    "ideal_answer": _task("ideal_answer", DEFAULT_CHAT_MODEL, 0.1),
+    "combined": _task("combined", DEFAULT_CHAT_MODEL, 0.1),
+    "grammar_batch": _task("grammar_batch", DEFAULT_CHAT_MODEL, 0.1),
+    "questions": _task("questions", DEFAULT_CHAT_MODEL, 0.7, max_tokens=2000, top_p=1),
+    "transcription": _task("transcription", DEFAULT_TRANSCRIPTION_MODEL, 0),
+}
+
+# Get grammar, correctness and ideal answer from one structured LLM call per answer
+LLM_COMBINED_MODE = os.getenv("LLM_COMBINED_MODE", "false").lower() == "true"
+
+# Send grammar requests arriving within GRAMMAR_BATCH_WINDOW_SECONDS as one LLM call
+# with numbered inputs (up to GRAMMAR_BATCH_MAX_ITEMS), to stay under request-per-minute caps
+GRAMMAR_BATCH_ENABLED = os.getenv("GRAMMAR_BATCH_ENABLED", "false").lower() == "true"
+GRAMMAR_BATCH_WINDOW_SECONDS = float(os.getenv("GRAMMAR_BATCH_WINDOW_SECONDS", "0.04"))
+GRAMMAR_BATCH_MAX_ITEMS = int(os.getenv("GRAMMAR_BATCH_MAX_ITEMS", "8"))
+
+# LLM response cache: in-memory LRU tier plus an optional SQLite tier
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH")
+LLM_CACHE_SQLITE_MAX_BYTES = int(os.getenv("LLM_CACHE_SQLITE_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# Transcription cache keyed by audio content hash, language and prompt
+TRANSCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_MAX_ENTRIES", "512"))
+TRANSCRIPTION_CACHE_TTL_SECONDS = float(os.getenv("TRANSCRIPTION_CACHE_TTL_SECONDS", "3600"))
+
+# Before transcription, decode uploads to 16 kHz mono, trim leading/trailing silence to
+# TRANSCRIPTION_SILENCE_MARGIN_SECONDS and internal silences to TRANSCRIPTION_MAX_PAUSE_SECONDS,
+# and re-encode as TRANSCRIPTION_ENCODING ("flac", "opus" or "wav")
+TRANSCRIPTION_PREPROCESS_ENABLED = os.getenv("TRANSCRIPTION_PREPROCESS_ENABLED", "true").lower() == "true"
+TRANSCRIPTION_ENCODING = os.getenv("TRANSCRIPTION_ENCODING", "flac")
+TRANSCRIPTION_MAX_PAUSE_SECONDS = float(os.getenv("TRANSCRIPTION_MAX_PAUSE_SECONDS", "1.0"))
+TRANSCRIPTION_SILENCE_MARGIN_SECONDS = float(os.getenv("TRANSCRIPTION_SILENCE_MARGIN_SECONDS", "0.2"))
+
+# Long recordings are cut at pauses into segments of about TRANSCRIPTION_CHUNK_TARGET_SECONDS
+# (never longer than TRANSCRIPTION_CHUNK_MAX_SECONDS) that are transcribed concurrently
+TRANSCRIPTION_CHUNKING_ENABLED = os.getenv("TRANSCRIPTION_CHUNKING_ENABLED", "false").lower() == "true"
+TRANSCRIPTION_CHUNK_MIN_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_MIN_SECONDS", "45"))
+TRANSCRIPTION_CHUNK_TARGET_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_TARGET_SECONDS", "20"))
+TRANSCRIPTION_CHUNK_MAX_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_MAX_SECONDS", "40"))
+TRANSCRIPTION_CHUNK_MIN_PAUSE_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_MIN_PAUSE_SECONDS", "0.5"))
+TRANSCRIPTION_CHUNK_OVERLAP_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_OVERLAP_SECONDS", "0.3"))
+TRANSCRIPTION_CHUNK_CONCURRENCY = int(os.getenv("TRANSCRIPTION_CHUNK_CONCURRENCY", "4"))
+
+# Pause detector used by get_pause_count: "vectorized" or the original frame "loop"
+PAUSE_DETECTION_METHOD = os.getenv("PAUSE_DETECTION_METHOD", "vectorized")
+
+# Uploaded recordings: one uniquely named file per request under UPLOAD_DIR.
+# Their audio_id stays valid for UPLOAD_TTL_SECONDS (as long as a finished job by default),
+# after which save_upload's sweep deletes them
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "temp_audio")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_TTL_SECONDS = float(os.getenv("UPLOAD_TTL_SECONDS", "900"))
+UPLOAD_SWEEP_INTERVAL_SECONDS = float(os.getenv("UPLOAD_SWEEP_INTERVAL_SECONDS", "60"))
+
+# Sample rate every acoustic analyzer works at (0 keeps the native rate of each upload).
+# Uploads are resampled while decoding: by ffmpeg, or with ANALYSIS_RESAMPLER (a librosa res_type)
+ANALYSIS_SAMPLE_RATE = int(os.getenv("ANALYSIS_SAMPLE_RATE", "16000")) or None
+ANALYSIS_RESAMPLER = os.getenv("ANALYSIS_RESAMPLER", "soxr_qq")
+# Frame and hop of the RMS energy envelope, in seconds so results do not depend on the rate
+ANALYSIS_FRAME_SECONDS = float(os.getenv("ANALYSIS_FRAME_SECONDS", "0.04"))
+ANALYSIS_HOP_SECONDS = float(os.getenv("ANALYSIS_HOP_SECONDS", "0.01"))
+
+# Assessment-level batch scoring
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "20"))
+BATCH_TRANSCRIPTION_CONCURRENCY = int(os.getenv("BATCH_TRANSCRIPTION_CONCURRENCY", "4"))
+BATCH_ANALYSIS_CONCURRENCY = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "4"))
+
+# Vocabulary lexicon (categories and inflections); defaults to feedback/data/vocabulary.json
+VOCABULARY_FILE = os.getenv("VOCABULARY_FILE")
+
+# Pre-generated question pool per (questionType, topic, difficulty, language)
+QUESTION_POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "true").lower() == "true"
+QUESTION_POOL_LOW_WATER = int(os.getenv("QUESTION_POOL_LOW_WATER", "10"))
+QUESTION_POOL_REFILL_BATCH = int(os.getenv("QUESTION_POOL_REFILL_BATCH", "15"))
+QUESTION_POOL_MAX_STOCK = int(os.getenv("QUESTION_POOL_MAX_STOCK", "60"))
+QUESTION_POOL_MAX_KEYS = int(os.getenv("QUESTION_POOL_MAX_KEYS", "256"))
+QUESTION_POOL_HISTORY_SIZE = int(os.getenv("QUESTION_POOL_HISTORY_SIZE", "100"))
+QUESTION_POOL_MAX_HISTORIES = int(os.getenv("QUESTION_POOL_MAX_HISTORIES", "10000"))
+
+# In-process job queue for asynchronous audio processing
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX_LENGTH = int(os.getenv("JOB_QUEUE_MAX_LENGTH", "100"))
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", "900"))
+JOB_LONG_POLL_MAX_SECONDS = float(os.getenv("JOB_LONG_POLL_MAX_SECONDS", "30"))
+
+# Process pool for CPU-bound acoustic analysis (0 runs it in a thread instead)
+ANALYSIS_PROCESS_WORKERS = int(os.getenv("ANALYSIS_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+ANALYSIS_PROCESS_START_METHOD = os.getenv("ANALYSIS_PROCESS_START_METHOD", "spawn")
+
+# Run deferred imports, decoding and the numba-compiled audio paths once after startup;
+# /ready returns 503 until this has finished
+STARTUP_WARMUP_ENABLED = os.getenv("STARTUP_WARMUP_ENABLED", "true").lower() == "true"
+
+# Transport under llmClient: "live" calls Groq, "record" also saves every response to
+# LLM_CASSETTE_PATH, "replay" serves recorded responses without network access
+LLM_TRANSPORT = os.getenv("LLM_TRANSPORT", "live")
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", "cassettes/llm.jsonl")
+# Replay: "exact" requests only, or any recorded response of the same call site ("task")
+LLM_REPLAY_MATCH = os.getenv("LLM_REPLAY_MATCH", "task")
+# Latency distribution spec, see llmTransport.LatencyModel (e.g. "recorded", "lognormal:0.8,0.5")
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "recorded")
+LLM_REPLAY_TRANSCRIPTION_LATENCY = os.getenv("LLM_REPLAY_TRANSCRIPTION_LATENCY")
+LLM_REPLAY_ERROR_RATE = float(os.getenv("LLM_REPLAY_ERROR_RATE", "0"))
+LLM_REPLAY_SEED = int(os.getenv("LLM_REPLAY_SEED")) if os.getenv("LLM_REPLAY_SEED") else None
+
+# Per-request profiling (X-Profile header or ?profile= query): "1" attaches a stage timing
+# tree to the response, "sample" also writes folded stacks to PROFILING_OUTPUT_DIR
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLER_ENABLED = os.getenv("PROFILING_SAMPLER_ENABLED", "true").lower() == "true"
+PROFILING_SAMPLE_INTERVAL_SECONDS = float(os.getenv("PROFILING_SAMPLE_INTERVAL_SECONDS", "0.005"))
+PROFILING_OUTPUT_DIR = os.getenv("PROFILING_OUTPUT_DIR", "profiles")
@@ -1,11 +1,99 @@
+import io
 import os
+import shutil
 import logging
-from pydub import AudioSegment
+import subprocess
+from typing import Optional, Tuple
+import numpy as np
 import asyncio
+from config.settings import ANALYSIS_SAMPLE_RATE, ANALYSIS_RESAMPLER, ANALYSIS_FRAME_SECONDS, ANALYSIS_HOP_SECONDS
+from metrics import track_stage
+import profiler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class AudioBuffer:
+    """Decoded mono float32 audio shared by the acoustic analyzers of one request."""
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, source: str = ""):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.source = source
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+def _decode_with_ffmpeg(input_path: str, sample_rate: int) -> np.ndarray:
+    """Decode, downmix and resample in a single ffmpeg pass, reading raw float32 PCM from stdout."""
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", input_path,
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "f32le", "-"
+    ]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return np.frombuffer(process.stdout, dtype=np.float32)
+
+def _decode_with_librosa(input_path: str, sample_rate: Optional[int]) -> tuple:
+    import librosa
+    return librosa.load(input_path, sr=sample_rate, mono=True, dtype=np.float32, res_type=ANALYSIS_RESAMPLER)
+
+def resample(samples: np.ndarray, orig_sr: int, target_sr: int, res_type: str = ANALYSIS_RESAMPLER) -> np.ndarray:
+    """Resample mono samples; the default low-quality soxr filter is plenty for energy features."""
+    if orig_sr == target_sr:
+        return samples
+    import librosa
+    return librosa.resample(samples, orig_sr=orig_sr, target_sr=target_sr, res_type=res_type)
+
+def frame_params(sample_rate: int, frame_seconds: float = ANALYSIS_FRAME_SECONDS, hop_seconds: float = ANALYSIS_HOP_SECONDS) -> Tuple[int, int]:
+    """(frame_length, hop_length) in samples for an analysis frame and hop given in seconds."""
+    return max(1, int(round(frame_seconds * sample_rate))), max(1, int(round(hop_seconds * sample_rate)))
+
+def decode_audio(input_path: str, sample_rate: Optional[int] = ANALYSIS_SAMPLE_RATE) -> AudioBuffer:
+    """
+    Decode an audio/video file once into a mono float32 buffer.
+    With a sample_rate, ffmpeg resamples while decoding; without one the native rate is kept.
+    """
+    if sample_rate and shutil.which("ffmpeg"):
+        samples = _decode_with_ffmpeg(input_path, sample_rate)
+    else:
+        samples, sample_rate = _decode_with_librosa(input_path, sample_rate)
+    logger.info(f"Decoded {input_path}: {len(samples) / sample_rate:.2f}s at {sample_rate} Hz")
+    profiler.annotate(
+        file_bytes=os.path.getsize(input_path), decoded_bytes=samples.nbytes,
+        samples=len(samples), sample_rate=sample_rate
+    )
+    return AudioBuffer(samples, sample_rate, source=input_path)
+
+# Encodings for audio sent to transcription: (soundfile format, subtype, file extension)
+ENCODINGS = {
+    "flac": ("FLAC", "PCM_16", ".flac"),
+    "opus": ("OGG", "OPUS", ".ogg"),
+    "wav": ("WAV", "PCM_16", ".wav"),
+}
+
+def encode_audio(samples: np.ndarray, sample_rate: int, encoding: str = "wav") -> bytes:
+    """Encode mono float samples in one of ENCODINGS."""
+    import soundfile as sf
+    audio_format, subtype, _ = ENCODINGS[encoding]
+    buffer = io.BytesIO()
+    sf.write(buffer, np.clip(samples, -1.0, 1.0), sample_rate, format=audio_format, subtype=subtype)
+    return buffer.getvalue()
+
+async def load_audio(input_path: str, sample_rate: Optional[int] = ANALYSIS_SAMPLE_RATE) -> Optional[AudioBuffer]:
+    """Decode audio for analysis without blocking the event loop. Returns None if decoding fails."""
+    try:
+        if not input_path or not os.path.exists(input_path):
+            logger.warning(f"Input file not found: {input_path}")
+            return None
+        async with track_stage("decode"):
+            return await asyncio.to_thread(decode_audio, os.path.abspath(input_path), sample_rate)
+    except Exception as e:
+        logger.error(f"Error decoding audio {input_path}: {e}")
+        return None
+
 async def convert_audio_to_wav(input_path: str) -> str:
     """Convert audio file to WAV format for processing"""
     try:
@@ -30,6 +118,7 @@ async def convert_audio_to_wav(input_path: str) -> str:
         # Run conversion in a thread pool
         def convert():
             try:
+                from pydub import AudioSegment
                 audio = AudioSegment.from_file(input_path)
                 audio.export(output_path, format='wav')
                 logger.info(f"Successfully converted {input_path} to {output_path}")
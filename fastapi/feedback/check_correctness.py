@@ -1,18 +1,24 @@
 import os
 import json
 import logging
-from groq import Groq
 from typing import Dict
+from config.settings import LLM_COMBINED_MODE
+from llmClient import chat_completion, task_settings
+from responseCache import llm_cache, make_key
+from .combined_analysis import analyze_combined
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-client = Groq(
-    api_key="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",
-)
+# Bump whenever the correctness prompt changes so cached responses are not reused
+CORRECTNESS_PROMPT_VERSION = "1"
 
-def check_answer_correctness(question: str, answer: str) -> Dict:
-    """Check the correctness of an answer for a given question."""
+async def check_answer_correctness(question: str, answer: str, use_combined: bool = LLM_COMBINED_MODE) -> Dict:
+    """
+    Check the correctness of an answer for a given question.
+    With use_combined the result comes from the combined call when it succeeds; callers
+    falling back from a failed combined call pass False to send only the correctness prompt.
+    """
     if not question or not answer:
         return {
             "score": 0,
@@ -24,6 +30,16 @@ def check_answer_correctness(question: str, answer: str) -> Dict:
         }
 
     try:
+        if use_combined:
+            combined = await analyze_combined(question, answer)
+            if combined is not None:
+                return combined["correctness"]
+
+        cache_key = make_key("correctness", task_settings("correctness")["model"], CORRECTNESS_PROMPT_VERSION, question, answer)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = """Analyze this answer based on its relevance to the question and quality of explanation.
         Provide ONLY a JSON response in this exact format:
         {
@@ -41,7 +57,8 @@ def check_answer_correctness(question: str, answer: str) -> Dict:
         
         Return ONLY the JSON object, no additional text or formatting."""
 
-        response = client.chat.completions.create(
+        content = await chat_completion(
+            "correctness",
             messages=[
                 {
                     "role": "system",
@@ -52,13 +69,10 @@ def check_answer_correctness(question: str, answer: str) -> Dict:
                     "content": f"Question: {question}\nAnswer: {answer}\n{prompt}"
                 }
             ],
-            model="meta-llama/llama-4-scout-17b-16e-instruct",
-            temperature=0.3,
-            
         )
 
         # Extract JSON from the response
-        content = response.choices[0].message.content.strip()
+        content = content.strip()
         content = content.replace('```json', '').replace('```', '').strip()
         
         try:
@@ -66,7 +80,7 @@ def check_answer_correctness(question: str, answer: str) -> Dict:
             # Calculate total score
             total_score = result.get('relevance_score', 0) + result.get('quality_score', 0)
             
-            return {
+            correctness = {
                 "score": total_score,
                 "relevance_score": result.get('relevance_score', 0),
                 "quality_score": result.get('quality_score', 0),
@@ -74,6 +88,8 @@ def check_answer_correctness(question: str, answer: str) -> Dict:
                 "suggestions": result.get('suggestions', ''),
                 "remark": result.get('remark', '')
             }
+            await llm_cache.set(cache_key, correctness)
+            return correctness
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse correctness response: {e}")
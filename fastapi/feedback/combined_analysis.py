@@ -0,0 +1,149 @@
+import json
+import asyncio
+import logging
+import unicodedata
+from typing import Dict, Optional
+from llmClient import chat_completion, task_settings
+from responseCache import llm_cache, make_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump whenever combined_prompt changes so cached responses are not reused
+COMBINED_PROMPT_VERSION = "1"
+
+combined_prompt = """You are a language assessment expert. For the given question and answer, return ONE JSON object with three sections.
+
+1. "grammar": grammatical errors in the answer, focusing ONLY on incorrect verb tenses, subject-verb agreement,
+   incorrect pronouns, incorrect word usage or word choice, run-on sentences or fragments, incorrect prepositions
+   and spelling errors. DO NOT count capitalization issues, missing final periods or stylistic choices.
+2. "correctness": relevance of the answer to the question (0-50) and quality of the explanation (0-50).
+3. "ideal_answer": a grammatically correct answer to the question, what the user did well and what could be improved,
+   all in the same language as the question.
+
+Format:
+{
+    "grammar": {
+        "error_count": number,
+        "errors": [
+            {"word": "incorrect_phrase_or_word", "suggestion": "correct_phrase_or_word", "explanation": "brief explanation of the error"}
+        ]
+    },
+    "correctness": {
+        "relevance_score": <score_0_to_50>,
+        "quality_score": <score_0_to_50>,
+        "feedback": "<detailed_feedback_about_both_aspects>",
+        "suggestions": "<specific_improvement_suggestions>",
+        "remark": "<brief_summary>"
+    },
+    "ideal_answer": {
+        "ideal_answer": "corrected grammatical answer",
+        "user_strengths": "what the user did well",
+        "areas_for_improvement": "where the answer could be improved"
+    }
+}
+
+Return ONLY the JSON object, no additional text."""
+
+# Combined calls currently in flight, so concurrent callers for the same input share one request
+_in_flight: Dict[str, asyncio.Task] = {}
+
+def _extract_json(response: str) -> Optional[Dict]:
+    """Load the JSON object from the response, tolerating code fences or surrounding text."""
+    text = unicodedata.normalize('NFKC', response).replace('```json', '').replace('```', '').strip()
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end+1])
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def split_combined_response(data: Dict) -> Optional[Dict]:
+    """
+    Split a parsed combined response into the shapes returned by analyze_grammar,
+    check_answer_correctness and IdealAnswerGenerator.generate_ideal_answer.
+    Returns None if any section is missing.
+    """
+    grammar = data.get("grammar")
+    correctness = data.get("correctness")
+    ideal = data.get("ideal_answer")
+    if not isinstance(grammar, dict) or not isinstance(correctness, dict) or not isinstance(ideal, dict):
+        return None
+    if not all(field in ideal for field in ['ideal_answer', 'user_strengths', 'areas_for_improvement']):
+        return None
+
+    relevance_score = correctness.get('relevance_score', 0)
+    quality_score = correctness.get('quality_score', 0)
+    return {
+        "grammar": {
+            "error_count": grammar.get("error_count", 0),
+            "errors": grammar.get("errors", [])
+        },
+        "correctness": {
+            "score": relevance_score + quality_score,
+            "relevance_score": relevance_score,
+            "quality_score": quality_score,
+            "feedback": correctness.get('feedback', ''),
+            "suggestions": correctness.get('suggestions', ''),
+            "remark": correctness.get('remark', '')
+        },
+        "ideal_answer": {
+            "status": "success",
+            "data": ideal
+        }
+    }
+
+async def _run_combined(cache_key: str, question: str, answer: str) -> Optional[Dict]:
+    response = await chat_completion(
+        "combined",
+        messages=[
+            {
+                "role": "system",
+                "content": combined_prompt,
+            },
+            {
+                "role": "user",
+                "content": f"Question: {question}\nAnswer: {answer}",
+            }
+        ],
+    )
+    data = _extract_json(response or "")
+    result = split_combined_response(data) if data else None
+    if result is None:
+        logger.warning(f"Combined response could not be parsed. Response (truncated): {str(response)[:500]}")
+        return None
+    await llm_cache.set(cache_key, result)
+    return result
+
+async def analyze_combined(question: str, answer: str) -> Optional[Dict]:
+    """
+    Get grammar, correctness and ideal-answer analysis from a single LLM call.
+
+    Returns:
+        Dict with "grammar", "correctness" and "ideal_answer" sections, or None if the
+        call or parsing failed and callers should fall back to the separate calls.
+    """
+    if not question or not answer:
+        return None
+
+    cache_key = make_key("combined", task_settings("combined")["model"], COMBINED_PROMPT_VERSION, question, answer)
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    task = _in_flight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_run_combined(cache_key, question, answer))
+        _in_flight[cache_key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(cache_key, None))
+
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Error in combined analysis: {e}")
+        return None
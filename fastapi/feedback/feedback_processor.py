@@ -1,27 +1,34 @@
 import os
 import json
 import re
+import asyncio
 import logging
-import random
-from groq import Groq
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from config.settings import ANALYSIS_TIMEOUT_SECONDS, LLM_COMBINED_MODE, GRAMMAR_BATCH_ENABLED
+from llmClient import chat_completion, task_settings
+from responseCache import llm_cache, make_key
 from .check_correctness import check_answer_correctness
+from .combined_analysis import analyze_combined
+from .grammar_batch import GrammarBatcher
 from .vocab_check import analyze_vocabulary
-from .get_pause import get_pause_count
-from .audio_utils import convert_audio_to_wav
+from .fillers import find_fillers
+from .get_pause import get_pause_count_from_buffer
+from .prosody import analyze_prosody
+from .audio_utils import AudioBuffer, load_audio
+from .process_pool import run_on_samples
+from metrics import track_stage
 
 # Load environment variables
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever grammar_prompt changes so cached responses are not reused
+GRAMMAR_PROMPT_VERSION = "1"
+
 class FeedbackProcessor:
     def __init__(self):
-        self.client = Groq(
-            api_key="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",
-        )
-
         self.grammar_prompt = """You are a grammar expert. Analyze the given text for grammatical errors, focusing ONLY on:
         - Incorrect verb tenses (e.g., "I goes" instead of "I go")
         - Subject-verb agreement errors
@@ -51,74 +58,18 @@ class FeedbackProcessor:
         
         Return ONLY the JSON object, no additional text."""
 
-        self.pronunciation_prompt = """You are a pronunciation expert. Analyze the given text for potential pronunciation challenges and mistakes, focusing on:
-        - Common pronunciation difficulties for non-native speakers
-        - Words with silent letters
-        - Complex phonetic combinations
-        - Stress patterns in multi-syllable words
-        - Commonly mispronounced words
-        - Sound pairs that are often confused (e.g., "th" vs "d")
-        
-        Format your response as a JSON object with two fields:
-        {
-            "error_count": number,
-            "errors": [
-                {
-                    "word": "challenging_word",
-                    "phonetic": "phonetic_representation",
-                    "explanation": "brief explanation of the pronunciation challenge"
-                }
-            ]
-        }
-        
-        Return ONLY the JSON object, no additional text."""
+        # Concurrent grammar requests share LLM calls when GRAMMAR_BATCH_ENABLED
+        self.grammar_batcher = GrammarBatcher(self.grammar_prompt, self._request_grammar)
 
-    def analyze_fluency(self, text: str) -> Dict:
+    def analyze_fluency(self, text: str, language: str = "English") -> Dict:
         """
         Analyze text for fluency by detecting filler words and hesitations.
+        Uses the precompiled filler lexicon for the transcript language.
         Returns a dictionary containing fluency metrics.
         """
-        # List of common filler words and hesitation sounds
-        filler_patterns = [
-            # Hesitation sounds
-            r'\b(hmm+|um+|uh+|aaa+|aa+|mmm+|mm+|ah+|er+|erm+|uhm+|uhmm+|uhhuh|uhuh|eh+|huh+|umm+)\b',
-            
-            # Common verbal fillers
-            r'\b(like|you know|basically|actually|literally|sort of|kind of|i mean|you see|right\?|okay\?|so yeah)\b',
-            
-            # Repetitive starts
-            r'\b(so|well|look|listen|see|okay|like|right|yeah|um so|so basically)\b\s+',
-            
-            # Uncertainty markers
-            r'\b(maybe|probably|somewhat|somehow|kind of like|sort of like|i guess|i think|i suppose)\b',
-            
-            # Time fillers
-            r'\b(at the end of the day|when all is said and done|you know what i mean|what im trying to say)\b',
-            
-            # Redundant phrases
-            r'\b(and stuff|and things|and everything|and all that|or something|or whatever)\b',
-            
-            # Overused transitions
-            r'\b(anyway|anyhow|moving on|going back to|coming back to|speaking of)\b'
-        ]
-
-        # Combine patterns into one regex
-        combined_pattern = '|'.join(filler_patterns)
-        
-        # Find all matches
-        matches = re.finditer(combined_pattern, text.lower())
-        
         # Store all filler words with their positions
-        filler_words = []
-        total_count = 0
-        
-        for match in matches:
-            filler_words.append({
-                "word": match.group(),
-                "position": match.start(),
-                "context": text[max(0, match.start()-20):min(len(text), match.end()+20)]
-            })
-            total_count += 1
+        filler_words = find_fillers(text, language)
+        total_count = len(filler_words)
 
         # Calculate fluency score (100 - deductions)
         # Deduct points based on the frequency of filler words
@@ -151,40 +102,29 @@ class FeedbackProcessor:
         Analyze text for grammar mistakes using Groq LLM.
         """
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self.grammar_prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze this text: {text}",
-                    }
-                ],
-                model="meta-llama/llama-4-scout-17b-16e-instruct",
-                temperature=0.1,
-            )
+            cache_key = make_key("grammar", task_settings("grammar")["model"], GRAMMAR_PROMPT_VERSION, text)
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-            # Defensive extraction of the model content (handle different response shapes)
-            analysis = None
-            try:
-                # typical structure
-                if hasattr(response, "choices") and response.choices:
-                    choice0 = response.choices[0]
-                    # support .message.content or .text depending on SDK
-                    analysis = getattr(getattr(choice0, "message", None), "content", None) or getattr(choice0, "text", None)
-                # fallback to string representation
-                if not analysis:
-                    analysis = str(response)
-            except Exception:
-                analysis = str(response)
+            if GRAMMAR_BATCH_ENABLED:
+                analysis = await self.grammar_batcher.analyze(text)
+            else:
+                analysis = await self._request_grammar(text)
 
             if not analysis or not str(analysis).strip():
-                logger.warning(f"Empty analysis from LLM. Raw response (truncated): {str(response)[:1000]}")
+                logger.warning("Empty analysis from LLM")
                 return {"error_count": 0, "errors": []}
 
-            return self._parse_grammar_response(analysis)
+            # Batched results arrive already split and parsed
+            data = analysis if isinstance(analysis, dict) else self._load_json_object(analysis)
+            if data is None:
+                # Unparseable responses fall back to the default and are not cached
+                return self._parse_grammar_response(analysis)
+
+            result = self._parse_grammar_response(data)
+            await llm_cache.set(cache_key, result)
+            return result
 
         except Exception as e:
             logger.exception(f"Error in analyze_grammar: {str(e)}")
@@ -193,9 +133,27 @@ class FeedbackProcessor:
                 "errors": []
             }
 
-    async def analyze_pronunciation(self, text: str, audio_file: str = None) -> Dict:
+    async def _request_grammar(self, text: str) -> str:
+        """One grammar LLM call for a single text; returns the raw response."""
+        return await chat_completion(
+            "grammar",
+            messages=[
+                {
+                    "role": "system",
+                    "content": self.grammar_prompt,
+                },
+                {
+                    "role": "user",
+                    "content": f"Analyze this text: {text}",
+                }
+            ],
+        )
+
+    async def analyze_pronunciation(self, text: str, audio_file: str = None, audio: Optional[AudioBuffer] = None) -> Dict:
         """
-        Analyze pronunciation using a random score between 80 and 100.
+        Score delivery from the recording's prosody: speech and articulation rate, energy
+        dynamics and pitch variability (see prosody.analyze_prosody).
+        If the request already decoded the audio, pass it as audio to skip decoding here.
         """
         if not text or len(text.split()) < 5:
             return {
@@ -204,16 +162,46 @@ class FeedbackProcessor:
                 "pronunciation_score": 0,
                 "feedback": "Answer too short or empty for meaningful pronunciation analysis"
             }
-        pronunciation_score = random.randint(80, 100)
-        return {
-            "error_count": 0,
-            "errors": [],
-            "pronunciation_score": pronunciation_score,
-            "feedback": self._generate_pronunciation_feedback(pronunciation_score / 100, 0, 0)
-        }
 
-    async def analyze_pauses(self, text: str, tempFileName: str) -> Dict:
-        """Analyze text for pauses using the pause count from the audio file."""
+        try:
+            if audio is None and audio_file and os.path.exists(audio_file):
+                audio = await load_audio(audio_file)
+            if audio is None:
+                logger.warning("No audio available for pronunciation analysis")
+                return {
+                    "error_count": 0,
+                    "errors": [],
+                    "pronunciation_score": 0,
+                    "feedback": "No audio available for pronunciation analysis"
+                }
+
+            async with track_stage("prosody"):
+                prosody = await run_on_samples(analyze_prosody, audio.samples, audio.sample_rate, word_count=len(text.split()))
+            pronunciation_score = prosody.pop("score")
+            tips = prosody.pop("tips")
+            return {
+                "error_count": 0,
+                "errors": [],
+                "pronunciation_score": pronunciation_score,
+                "feedback": " ".join([self._generate_pronunciation_feedback(pronunciation_score / 100, 0, 0), *tips]),
+                "prosody": prosody
+            }
+
+        except Exception as e:
+            logger.error(f"Error in pronunciation analysis: {str(e)}")
+            return {
+                "error_count": 0,
+                "errors": [],
+                "pronunciation_score": 0,
+                "feedback": "Pronunciation analysis failed",
+                "error": str(e)
+            }
+
+    async def analyze_pauses(self, text: str, tempFileName: str, audio: Optional[AudioBuffer] = None) -> Dict:
+        """
+        Analyze text for pauses using the pause count from the audio file.
+        If the request already decoded the audio, pass it as audio to skip decoding here.
+        """
         logger.info(f"Starting pause analysis with file: {tempFileName}")
         if not text or len(text.split()) < 5:
             return {
@@ -249,22 +237,11 @@ class FeedbackProcessor:
                     "message": f"Audio file not found at: {audio_path}"
                 }
 
-            # Try converting audio to WAV, catch conversion errors
-            try:
-                wav_file = await convert_audio_to_wav(audio_path)
-            except Exception as conv_err:
-                logger.error(f"Conversion error: {conv_err}")
-                return {
-                    "total_pauses": 0,
-                    "pause_details": [],
-                    "total_pause_duration": 0.0,
-                    "pause_percentage": 0.0,
-                    "pause_score": 0.0,
-                    "message": f"Audio conversion failed: {conv_err}"
-                }
+            if audio is None:
+                audio = await load_audio(audio_path)
 
-            if not wav_file:
-                logger.error("Failed to convert audio file")
+            if audio is None:
+                logger.error("Failed to decode audio file")
                 return {
                     "total_pauses": 0,
                     "pause_details": [],
@@ -274,7 +251,9 @@ class FeedbackProcessor:
                     "message": "Audio conversion failed"
                 }
 
-            pause_analysis = get_pause_count(wav_file)
+            # Off the event loop and across cores
+            async with track_stage("pause_detection"):
+                pause_analysis = await run_on_samples(get_pause_count_from_buffer, audio.samples, audio.sample_rate)
             logger.info(f"Raw pause analysis from get_pause_count: {pause_analysis}")
 
             total_pauses = pause_analysis.get("total_pauses", 0)
@@ -329,6 +308,24 @@ class FeedbackProcessor:
                 "message": "Error during pause analysis"
             }
 
+    @staticmethod
+    def _load_json_object(text: str) -> Optional[Dict]:
+        """Load a JSON object from text, extracting it from surrounding noise if needed. Returns None on failure."""
+        resp_text = str(text).strip()
+        try:
+            data = json.loads(resp_text)
+            return data if isinstance(data, dict) else None
+        except json.JSONDecodeError:
+            start = resp_text.find("{")
+            end = resp_text.rfind("}")
+            if start != -1 and end != -1 and end > start:
+                try:
+                    data = json.loads(resp_text[start:end+1])
+                    return data if isinstance(data, dict) else None
+                except json.JSONDecodeError:
+                    return None
+            return None
+
     def _parse_grammar_response(self, response: str) -> Dict:
         """
         Parse the LLM response for grammar analysis.
@@ -384,50 +381,70 @@ class FeedbackProcessor:
                 "errors": []
             }
 
-    def _parse_pronunciation_response(self, response: str) -> Dict:
-        """
-        Parse the LLM response for pronunciation analysis.
+    async def analyze_text(self, text: str, question: Optional[str] = None, tempFileName: str = '', language: str = "English") -> Dict:
         """
-        try:
-            # Parse the JSON response
-            data = json.loads(response)
-            return {
-                "error_count": data.get("error_count", 0),
-                "errors": data.get("errors", [])
-            }
-        except Exception as e:
-            print(f"Error parsing pronunciation response: {str(e)}")
-            return {
-                "error_count": 0,
-                "errors": []
-            }
+        Analyze text for grammar, pronunciation, vocabulary, fluency and answer correctness.
 
-    async def analyze_text(self, text: str, question: Optional[str] = None, tempFileName: str = '') -> Dict:
+        The LLM calls and the audio analysis run concurrently under a single
+        deadline (ANALYSIS_TIMEOUT_SECONDS); any section that fails or does not
+        finish in time is replaced by its empty default. With LLM_COMBINED_MODE,
+        grammar, correctness and the ideal answer come from one LLM call and the
+        ideal answer is included in the feedback.
         """
-        Analyze text for grammar, pronunciation, vocabulary, fluency and answer correctness.
+        feedback = {}
+        async for event, data in self.analyze_text_stream(text, question, tempFileName, language):
+            if event in ("summary", "error"):
+                feedback = data
+        return feedback
+
+    async def analyze_text_stream(
+        self, text: str, question: Optional[str] = None, tempFileName: str = '', language: str = "English"
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Streaming variant of analyze_text.
+
+        Yields (section, result) pairs in the order the sections finish: vocabulary and
+        fluency first, then pauses, pronunciation, grammar, correctness and (in combined
+        mode) ideal_answer as their tasks complete. The last pair is ("summary", feedback)
+        with the same dict analyze_text returns, or ("error", {"error": ...}) on failure.
         """
+        audio_task = None
+        sections = None
         try:
-            grammar_analysis = await self.analyze_grammar(text)
-            pronunciation_analysis = await self.analyze_pronunciation(text, tempFileName)
+            # Cheap, CPU-only analyzers run inline
             vocabulary_analysis = analyze_vocabulary(text)
-            fluency_analysis = self.analyze_fluency(text)
-            pause_analysis = await self.analyze_pauses(text, tempFileName)
-            
+            yield "vocabulary", vocabulary_analysis
+            fluency_analysis = self.analyze_fluency(text, language)
+            yield "fluency", fluency_analysis
+
+            # Decode the recording once; acoustic analyzers share the buffer. Shielded, so a
+            # section that times out does not cancel the decode its sibling is waiting on
+            audio_task = asyncio.create_task(self._load_request_audio(tempFileName))
+
+            async def pauses_section():
+                return await self.analyze_pauses(text, tempFileName, await asyncio.shield(audio_task))
+
+            async def pronunciation_section():
+                return await self.analyze_pronunciation(text, tempFileName, await asyncio.shield(audio_task))
+
+            tasks = {
+                "pronunciation": asyncio.create_task(pronunciation_section()),
+                "pauses": asyncio.create_task(pauses_section()),
+            }
+
             # Get correctness analysis if question is provided
             correctness_analysis = None
-            if question and isinstance(question, str) and question.strip() and isinstance(text, str) and text.strip():
-                try:
-                    correctness_analysis = check_answer_correctness(question, text)
-                    logger.info(f"Correctness analysis completed with scores - Relevance: {correctness_analysis.get('relevance_score', 0)}, Quality: {correctness_analysis.get('quality_score', 0)}")
-                except Exception as e:
-                    # Catch errors from the correctness service and return a structured error instead of raising
-                    logger.exception(f"Error calling check_answer_correctness: {e}")
-                    correctness_analysis = {
-                        "error": "Failed to generate correctness/ideal-answer",
-                        "detail": str(e),
-                        "status_code": 500
-                    }
+            has_question = bool(question and isinstance(question, str) and question.strip() and isinstance(text, str) and text.strip())
+            use_combined = LLM_COMBINED_MODE and has_question
+            if use_combined:
+                # One structured call covers grammar, correctness and the ideal answer
+                tasks["combined"] = asyncio.create_task(analyze_combined(question, text))
             else:
+                tasks["grammar"] = asyncio.create_task(self.analyze_grammar(text))
+                if has_question:
+                    tasks["correctness"] = asyncio.create_task(check_answer_correctness(question, text))
+
+            if not has_question:
                 # Provide a clear structured response when inputs are missing (prevents upstream 500)
                 if question is None or not isinstance(question, str) or not question.strip():
                     logger.warning("Correctness check skipped: missing or empty question.")
@@ -437,22 +454,134 @@ class FeedbackProcessor:
                     "error": "Both question and user answer are required for correctness analysis",
                     "status_code": 400
                 }
+                yield "correctness", correctness_analysis
+
+            results = {}
+            ideal_answer_analysis = None
+            sections = self._iter_sections(tasks, ANALYSIS_TIMEOUT_SECONDS)
+            async for name, result in sections:
+                if name != "combined":
+                    results[name] = result
+                    yield name, result
+                elif result is not None:
+                    for section in ("grammar", "correctness", "ideal_answer"):
+                        yield section, result[section]
+                    results["grammar"] = result["grammar"]
+                    results["correctness"] = result["correctness"]
+                    ideal_answer_analysis = result["ideal_answer"]
+                else:
+                    # Picked up by _iter_sections on its next pass, within what is left of the deadline
+                    logger.warning("Combined analysis unavailable, falling back to separate grammar and correctness calls")
+                    tasks["grammar"] = asyncio.create_task(self.analyze_grammar(text))
+                    tasks["correctness"] = asyncio.create_task(check_answer_correctness(question, text, use_combined=False))
+
+            if "correctness" in results:
+                correctness_analysis = results["correctness"]
+                logger.info(f"Correctness analysis completed with scores - Relevance: {correctness_analysis.get('relevance_score', 0)}, Quality: {correctness_analysis.get('quality_score', 0)}")
 
             feedback = {
-                "grammar": grammar_analysis,
-                "pronunciation": pronunciation_analysis,
+                "grammar": results["grammar"],
+                "pronunciation": results["pronunciation"],
                 "vocabulary": vocabulary_analysis,
                 "fluency": fluency_analysis,
-                "pauses": pause_analysis,
+                "pauses": results["pauses"],
                 "correctness": correctness_analysis,
                 "text": text
             }
+            if ideal_answer_analysis is not None:
+                feedback["ideal_answer"] = ideal_answer_analysis
 
-            return feedback
+            yield "summary", feedback
 
         except Exception as e:
             logger.error(f"Error in analyze_text: {e}")
-            return {"error": str(e)}
+            yield "error", {"error": str(e)}
+        finally:
+            # Cancels whatever is still running if the consumer stops early
+            if sections is not None:
+                await sections.aclose()
+            if audio_task is not None:
+                audio_task.cancel()
+
+    @staticmethod
+    async def _load_request_audio(tempFileName: Optional[str]) -> Optional[AudioBuffer]:
+        """Decode the request's recording, or return None when there is none."""
+        if not tempFileName or not os.path.exists(tempFileName):
+            return None
+        return await load_audio(tempFileName)
+
+    async def _iter_sections(self, tasks: Dict[str, asyncio.Task], timeout: float) -> AsyncIterator[Tuple[str, Optional[Dict]]]:
+        """
+        Yield (name, result) for each section task as soon as it finishes.
+
+        All tasks share one deadline, `timeout` seconds from the start of the iteration;
+        failed or late sections yield their fallback. Tasks the caller adds to `tasks` while
+        iterating are picked up too, with only the time left before that deadline. Anything
+        still pending when the iteration is closed is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while tasks:
+                wait_for = deadline - loop.time()
+                if wait_for > 0:
+                    done, _ = await asyncio.wait(tasks.values(), timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    # Past the deadline: without yielding, so tasks added just now never start
+                    done = {task for task in tasks.values() if task.done()}
+
+                now = loop.time()
+                for name, task in list(tasks.items()):
+                    if task in done:
+                        del tasks[name]
+                        if task.cancelled():
+                            logger.warning(f"Section '{name}' was cancelled")
+                            yield name, self._section_fallback(name, f"{name} analysis was cancelled")
+                        elif task.exception() is not None:
+                            # Catch errors from the analyzers and return a structured error instead of raising
+                            logger.error(f"Error in {name} analysis: {task.exception()}")
+                            yield name, self._section_fallback(name, str(task.exception()))
+                        else:
+                            yield name, task.result()
+                    elif deadline <= now:
+                        del tasks[name]
+                        task.cancel()
+                        logger.warning(f"Section '{name}' did not finish within {timeout}s")
+                        yield name, self._section_fallback(name, f"{name} analysis timed out")
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    @staticmethod
+    def _section_fallback(name: str, message: str) -> Optional[Dict]:
+        """Default result for a section that failed or timed out."""
+        if name == "combined":
+            # Callers fall back to the separate calls
+            return None
+        if name == "pauses":
+            return {
+                "total_pauses": 0,
+                "pause_details": [],
+                "total_pause_duration": 0.0,
+                "pause_percentage": 0.0,
+                "pause_score": 0.0,
+                "error": message,
+                "message": "Error during pause analysis"
+            }
+        if name == "pronunciation":
+            return {
+                "error_count": 0,
+                "errors": [],
+                "pronunciation_score": 0,
+                "feedback": "Pronunciation analysis unavailable"
+            }
+        if name == "correctness":
+            return {
+                "error": "Failed to generate correctness/ideal-answer",
+                "detail": message,
+                "status_code": 500
+            }
+        return {"error_count": 0, "errors": []}
 
     def _generate_pronunciation_feedback(self, confidence: float, error_count: int, total_words: int) -> str:
         """Generate feedback message based on pronunciation analysis."""
@@ -0,0 +1,107 @@
+import re
+import logging
+from typing import Dict, List, Set
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# English filler patterns (hesitations, verbal fillers, repetitive starts, uncertainty markers,
+# time fillers, redundant phrases and overused transitions)
+ENGLISH_FILLER_PATTERNS = [
+    # Hesitation sounds
+    r'\b(hmm+|um+|uh+|aaa+|aa+|mmm+|mm+|ah+|er+|erm+|uhm+|uhmm+|uhhuh|uhuh|eh+|huh+|umm+)\b',
+
+    # Common verbal fillers
+    r'\b(like|you know|basically|actually|literally|sort of|kind of|i mean|you see|right\?|okay\?|so yeah)\b',
+
+    # Repetitive starts
+    r'\b(so|well|look|listen|see|okay|like|right|yeah|um so|so basically)\b\s+',
+
+    # Uncertainty markers
+    r'\b(maybe|probably|somewhat|somehow|kind of like|sort of like|i guess|i think|i suppose)\b',
+
+    # Time fillers
+    r'\b(at the end of the day|when all is said and done|you know what i mean|what im trying to say)\b',
+
+    # Redundant phrases
+    r'\b(and stuff|and things|and everything|and all that|or something|or whatever)\b',
+
+    # Overused transitions
+    r'\b(anyway|anyhow|moving on|going back to|coming back to|speaking of)\b'
+]
+
+# Hesitation markers Whisper is prompted to keep (see audioProcessor.PROMPTS)
+HESITATION_MARKERS = {
+    "Hindi": ['हम्म', 'उम्', 'उह', 'आआ', 'आ', 'मम्म', 'मम', 'आह', 'एर', 'एर्म', 'उहम', 'उहमम', 'उहुँ', 'उहुह'],
+    "Bengali": ['হুম', 'উম', 'উহ', 'আআ', 'আ', 'ম্ম', 'ম', 'আহ', 'এর', 'এর্ম', 'উহম', 'উহমম', 'উহুহ', 'উহু'],
+    "Gujarati": ['હમ્મ', 'ઉમ', 'ઉહ', 'આઆ', 'આ', 'મ્મ', 'મ', 'આહ', 'એર', 'એર્મ', 'ઉહમ', 'ઉહમમ', 'ઉહુહ', 'ઉહુ'],
+    "Kannada": ['ಹುಮ್', 'ಉಮ್', 'ಉಹ್', 'ಆಆ', 'ಆ', 'ಮ್ಮೆ', 'ಮ್', 'ಆಹ್', 'ಎರ್', 'ಎರ್ಮ್', 'ಉಹಮ್', 'ಉಹ್ಮ್ಮ್', 'ಉಹುಹ್', 'ಉಹು'],
+    "Malayalam": ['ഹം', 'ഉം', 'ഉഹ്', 'ആആ', 'ആ', 'മ്മ്', 'മ്', 'ആഹ്', 'എർ', 'എർം', 'ഉഹ്‌ം', 'ഉഹ്മ്മ്', 'ഉഹുഹ്', 'ഉഹു'],
+    "Marathi": ['हम्म', 'उम्', 'उह', 'आआ', 'आ', 'म्म', 'म', 'आह', 'एर', 'एर्म', 'उहम', 'उहम्म', 'उहुँ', 'उहु'],
+    "Punjabi": ['ਹਮਮ', 'ਉਮ', 'ਉਹ', 'ਆਆ', 'ਆ', 'ਮਮਮ', 'ਮਮ', 'ਆਹ', 'ਏਰ', 'ਏਰਮ', 'ਉਹਮ', 'ਉਹਮਮ', 'ਉਹੁਹ', 'ਉਹੁ'],
+    "Tamil": ['ஹும்', 'உம்', 'உஹ்', 'ஆஆ', 'ஆ', 'ம்', 'ம', 'ஆஹ்', 'ஏர்', 'ஏர்ம்', 'உஹம்', 'உஹ்ம்ம்', 'உஹுஹ்', 'உஹு'],
+    "Telugu": ['హమ్', 'ఉమ్', 'ఉహ్', 'ఆఆ', 'ఆ', 'మ్మ్', 'మ్', 'ఆహ్', 'ఎర్', 'ఎర్మ్', 'ఉహమ్', 'ఉహ్మ్మ్', 'ఉహుహ్', 'ఉహు'],
+    "Assamese": ['হুম', 'উম', 'উহ', 'আআ', 'আ', 'ম্ম', 'ম', 'আহ', 'এৰ', 'এৰ্ম', 'উহম', 'উহম্ম', 'উহুহ', 'উহু'],
+}
+
+# \b does not work for Indic scripts (vowel signs and viramas are not word characters),
+# so markers must be bounded by whitespace, punctuation or the ends of the text
+_TOKEN_SEPARATORS = r'\s.,;:!?।॥"\'()\[\]\-'
+_TOKEN_START = rf'(?<![^{_TOKEN_SEPARATORS}])'
+_TOKEN_END = rf'(?![^{_TOKEN_SEPARATORS}])'
+
+def _marker_pattern(markers: List[str]) -> str:
+    # Longest first, so e.g. 'आआ' wins over 'आ' at the same position
+    alternatives = '|'.join(re.escape(marker) for marker in sorted(set(markers), key=len, reverse=True))
+    return f'{_TOKEN_START}(?:{alternatives}){_TOKEN_END}'
+
+def _first_chars(patterns: List[str]) -> Set[str]:
+    """First characters of every alternative inside the patterns' groups."""
+    chars = set()
+    for pattern in patterns:
+        group = re.search(r'\((.*)\)', pattern)
+        for alternative in (group.group(1) if group else pattern).split('|'):
+            chars.add(alternative[0])
+    return chars
+
+def _guarded(pattern: str, first_chars: Set[str]) -> re.Pattern:
+    # A one-character lookahead lets the scan skip positions no alternative can start at,
+    # instead of trying every branch at every character
+    char_class = ''.join(re.escape(char) for char in sorted(first_chars))
+    return re.compile(f'(?=[{char_class}])(?:{pattern})')
+
+def _compile_matchers() -> Dict[str, re.Pattern]:
+    english_chars = _first_chars(ENGLISH_FILLER_PATTERNS)
+    matchers = {"English": _guarded('|'.join(ENGLISH_FILLER_PATTERNS), english_chars)}
+    hesitation_chars = _first_chars(ENGLISH_FILLER_PATTERNS[:1])
+    for language, markers in HESITATION_MARKERS.items():
+        # English hesitation sounds show up in every language's transcripts
+        matchers[language] = _guarded(
+            f'{_marker_pattern(markers)}|{ENGLISH_FILLER_PATTERNS[0]}',
+            {marker[0] for marker in markers} | hesitation_chars
+        )
+    return matchers
+
+# One precompiled pattern per language, built once at import
+FILLER_MATCHERS = _compile_matchers()
+
+def find_fillers(text: str, language: str = "English") -> List[Dict]:
+    """
+    Find filler words and hesitation markers in one pass over the text.
+
+    Args:
+        text (str): Transcript to scan
+        language (str): Transcript language; unknown languages use the English lexicon
+
+    Returns:
+        List[Dict]: word, position and surrounding context of each match
+    """
+    matcher = FILLER_MATCHERS.get(language, FILLER_MATCHERS["English"])
+    return [
+        {
+            "word": match.group(),
+            "position": match.start(),
+            "context": text[max(0, match.start()-20):min(len(text), match.end()+20)]
+        }
+        for match in matcher.finditer(text.lower())
+    ]
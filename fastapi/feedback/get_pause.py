@@ -1,13 +1,167 @@
 import os
 import logging
+from typing import Dict, List, Tuple
 import numpy as np
-import librosa
+from config.settings import PAUSE_DETECTION_METHOD, ANALYSIS_FRAME_SECONDS, ANALYSIS_HOP_SECONDS
+from .audio_utils import decode_audio, frame_params
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_pause_count(audio_path: str, threshold_seconds=0.8, amplitude_threshold=0.015):
-    """Analyze audio file for pauses."""
+def find_silent_runs(envelope: np.ndarray, times: np.ndarray, amplitude_threshold: float, threshold_seconds: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find runs of frames below amplitude_threshold lasting at least threshold_seconds.
+
+    A run starts at its first silent frame and ends at the first loud frame after it,
+    or at the last frame if the audio ends while silent.
+
+    Returns:
+        Tuple of (start_times, end_times, durations) arrays
+    """
+    silent = np.asarray(envelope) < amplitude_threshold
+    if silent.size == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, empty
+
+    # Rising edges mark run starts, falling edges the first frame after each run
+    edges = np.diff(np.concatenate(([0], silent.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.minimum(np.flatnonzero(edges == -1), silent.size - 1)
+
+    start_times = times[starts]
+    end_times = times[ends]
+    durations = end_times - start_times
+    keep = durations >= threshold_seconds
+    return start_times[keep], end_times[keep], durations[keep]
+
+def find_speech_intervals(audio: np.ndarray, sample_rate: int, amplitude_threshold=0.015, max_pause_seconds=1.0, margin_seconds=0.2,
+                          frame_seconds: float = ANALYSIS_FRAME_SECONDS, hop_seconds: float = ANALYSIS_HOP_SECONDS) -> List[Tuple[int, int]]:
+    """
+    Sample ranges to keep when trimming silence, using the same RMS envelope as pause detection.
+    Leading and trailing silence is cut to margin_seconds and internal silences to max_pause_seconds.
+
+    Returns:
+        List of (start, end) sample indices in order; empty if the audio is all zeros
+    """
+    import librosa
+
+    peak = np.max(np.abs(audio)) if audio.size else 0.0
+    if peak == 0:
+        return []
+    frame_length, hop_length = frame_params(sample_rate, frame_seconds, hop_seconds)
+    envelope = librosa.feature.rms(y=audio / peak, frame_length=frame_length, hop_length=hop_length)[0]
+    times = librosa.times_like(envelope, sr=sample_rate, hop_length=hop_length)
+    start_times, end_times, _ = find_silent_runs(envelope, times, amplitude_threshold, margin_seconds)
+
+    duration = len(audio) / sample_rate
+    cuts = []
+    for start, end in zip(start_times, end_times):
+        if start <= times[0]:
+            cuts.append((0.0, end - margin_seconds))
+        elif end >= times[-1]:
+            cuts.append((start + margin_seconds, duration))
+        elif end - start > max_pause_seconds:
+            cuts.append((start + max_pause_seconds / 2, end - max_pause_seconds / 2))
+
+    intervals = []
+    position = 0
+    for start, end in cuts:
+        first, last = int(start * sample_rate), int(end * sample_rate)
+        if first > position:
+            intervals.append((position, first))
+        position = max(position, last)
+    if position < len(audio):
+        intervals.append((position, len(audio)))
+    return intervals
+
+def _detect_pauses_vectorized(envelope: np.ndarray, times: np.ndarray, amplitude_threshold: float, threshold_seconds: float) -> List[Dict]:
+    """Run-length pause detection over the whole envelope at once."""
+    start_times, end_times, durations = find_silent_runs(envelope, times, amplitude_threshold, threshold_seconds)
+    return [
+        {
+            'start': round(start, 2),
+            'end': round(end, 2),
+            'duration': round(duration, 2)
+        }
+        for start, end, duration in zip(start_times, end_times, durations)
+    ]
+
+def _detect_pauses_loop(envelope: np.ndarray, times: np.ndarray, amplitude_threshold: float, threshold_seconds: float) -> List[Dict]:
+    """Frame-by-frame pause detection, kept for comparison with the vectorized version."""
+    pauses = []
+    in_pause = False
+    pause_start = 0
+    
+    for i in range(len(envelope)):
+        # Check if current segment is below amplitude threshold
+        if envelope[i] < amplitude_threshold:
+            if not in_pause:
+                pause_start = times[i]
+                in_pause = True
+        else:
+            if in_pause:
+                pause_duration = times[i] - pause_start
+                if pause_duration >= threshold_seconds:
+                    pauses.append({
+                        'start': round(pause_start, 2),
+                        'end': round(times[i], 2),
+                        'duration': round(pause_duration, 2)
+                    })
+                in_pause = False
+    
+    # Handle pause at the end of audio
+    if in_pause:
+        pause_duration = times[-1] - pause_start
+        if pause_duration >= threshold_seconds:
+            pauses.append({
+                'start': round(pause_start, 2),
+                'end': round(times[-1], 2),
+                'duration': round(pause_duration, 2)
+            })
+    return pauses
+
+PAUSE_DETECTORS = {
+    "vectorized": _detect_pauses_vectorized,
+    "loop": _detect_pauses_loop,
+}
+
+def get_pause_count_from_buffer(audio: np.ndarray, sample_rate: int, threshold_seconds=0.8, amplitude_threshold=0.015, method: str = PAUSE_DETECTION_METHOD,
+                                frame_seconds: float = ANALYSIS_FRAME_SECONDS, hop_seconds: float = ANALYSIS_HOP_SECONDS) -> Dict:
+    """Analyze an already decoded mono buffer for pauses. Frame and hop are in seconds, so any sample rate gives the same timings."""
+    # Imported here: the first librosa.feature call loads numba and scipy (see warmup.py)
+    import librosa
+
+    # Normalize audio
+    audio = librosa.util.normalize(audio)
+    
+    # Calculate the time resolution
+    frame_length, hop_length = frame_params(sample_rate, frame_seconds, hop_seconds)
+    
+    # Extract the envelope using RMS energy (more reliable than onset strength)
+    audio_envelope = librosa.feature.rms(y=audio, frame_length=frame_length, hop_length=hop_length)[0]
+    
+    # Convert envelope to time in seconds
+    times = librosa.times_like(audio_envelope, sr=sample_rate, hop_length=hop_length)
+    
+    # Detect periods of silence
+    detect_pauses = PAUSE_DETECTORS.get(method, _detect_pauses_vectorized)
+    pauses = detect_pauses(audio_envelope, times, amplitude_threshold, threshold_seconds)
+
+    result = {
+        'total_pauses': len(pauses),
+        'pause_details': pauses,
+        'total_pause_duration': round(sum(p['duration'] for p in pauses), 2),
+        'audio_duration': round(len(audio) / sample_rate, 2)
+    }
+    
+    logger.info(f"Detected {len(pauses)} pauses in audio")
+    return result
+
+def get_pause_count(audio_path: str, threshold_seconds=0.8, amplitude_threshold=0.015, method: str = PAUSE_DETECTION_METHOD):
+    """
+    Analyze audio file for pauses.
+    method selects the detector: "vectorized" (default) or the original frame "loop".
+    """
     try:
         if not audio_path or not os.path.exists(audio_path):
             logger.warning(f"Audio file not found: {audio_path}")
@@ -19,9 +173,10 @@ def get_pause_count(audio_path: str, threshold_seconds=0.8, amplitude_threshold=
             }
 
         logger.info(f"Loading audio file: {audio_path}")
-        # Load audio file
+        # Load audio file at the analysis rate
         try:
-            audio, sample_rate = librosa.load(audio_path, sr=None)
+            buffer = decode_audio(audio_path)
+            audio, sample_rate = buffer.samples, buffer.sample_rate
             logger.info("Successfully loaded audio file")
         except Exception as e:
             logger.error(f"Error loading audio: {e}")
@@ -32,58 +187,7 @@ def get_pause_count(audio_path: str, threshold_seconds=0.8, amplitude_threshold=
                 "error": f"Error loading audio: {str(e)}"
             }
 
-        # Normalize audio
-        audio = librosa.util.normalize(audio)
-        
-        # Calculate the time resolution
-        hop_length = 512
-        
-        # Extract the envelope using RMS energy (more reliable than onset strength)
-        audio_envelope = librosa.feature.rms(y=audio, hop_length=hop_length)[0]
-        
-        # Convert envelope to time in seconds
-        times = librosa.times_like(audio_envelope, sr=sample_rate, hop_length=hop_length)
-        
-        # Detect periods of silence
-        pauses = []
-        in_pause = False
-        pause_start = 0
-        
-        for i in range(len(audio_envelope)):
-            # Check if current segment is below amplitude threshold
-            if audio_envelope[i] < amplitude_threshold:
-                if not in_pause:
-                    pause_start = times[i]
-                    in_pause = True
-            else:
-                if in_pause:
-                    pause_duration = times[i] - pause_start
-                    if pause_duration >= threshold_seconds:
-                        pauses.append({
-                            'start': round(pause_start, 2),
-                            'end': round(times[i], 2),
-                            'duration': round(pause_duration, 2)
-                        })
-                    in_pause = False
-        
-        # Handle pause at the end of audio
-        if in_pause:
-            pause_duration = times[-1] - pause_start
-            if pause_duration >= threshold_seconds:
-                pauses.append({
-                    'start': round(pause_start, 2),
-                    'end': round(times[-1], 2),
-                    'duration': round(pause_duration, 2)
-                })
-
-        result = {
-            'total_pauses': len(pauses),
-            'pause_details': pauses,
-            'total_pause_duration': round(sum(p['duration'] for p in pauses), 2)
-        }
-        
-        logger.info(f"Detected {len(pauses)} pauses in audio")
-        return result
+        return get_pause_count_from_buffer(audio, sample_rate, threshold_seconds, amplitude_threshold, method)
 
     except Exception as e:
         logger.error(f"Error processing audio file: {e}")
@@ -0,0 +1,147 @@
+import json
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from config.settings import GRAMMAR_BATCH_WINDOW_SECONDS, GRAMMAR_BATCH_MAX_ITEMS
+from llmClient import chat_completion
+from .combined_analysis import _extract_json
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+batch_instructions = """
+
+You will receive several numbered texts, each between [TEXT n] and [END n]. Analyze each one
+independently, exactly as described above. Format your response as ONE JSON object:
+{
+    "results": [
+        {"id": n, "error_count": number, "errors": [...]}
+    ]
+}
+with one entry per text, using the same "errors" format as above.
+
+Return ONLY the JSON object, no additional text."""
+
+def build_batch_input(texts: List[str]) -> str:
+    return "\n\n".join(f"[TEXT {i}]\n{text}\n[END {i}]" for i, text in enumerate(texts, start=1))
+
+def split_batch_response(response: str, count: int) -> List[Optional[Dict]]:
+    """
+    Per-text grammar results from a batched response, in input order. Entries that are
+    missing or malformed are None, so only those texts need an individual call.
+    """
+    results: List[Optional[Dict]] = [None] * count
+    data = _extract_json(response or "")
+    entries = data.get("results") if data else None
+    if not isinstance(entries, list):
+        return results
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("errors", []), list):
+            continue
+        try:
+            index = int(entry.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count and results[index] is None:
+            results[index] = {"error_count": entry.get("error_count", 0), "errors": entry.get("errors", [])}
+    return results
+
+class GrammarBatcher:
+    """
+    Collects grammar requests arriving within a short window and sends them as one LLM call.
+
+    The first request of a batch waits at most window_seconds for others; a batch is sent as
+    soon as it holds max_items. Results are split back per caller. A batch of one, a failed
+    batch call, and any text missing from the batched response go through single_call instead.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        single_call: Callable[[str], Awaitable[str]],
+        window_seconds: float = GRAMMAR_BATCH_WINDOW_SECONDS,
+        max_items: int = GRAMMAR_BATCH_MAX_ITEMS,
+    ):
+        self.system_prompt = system_prompt + batch_instructions
+        self.single_call = single_call
+        self.window_seconds = window_seconds
+        self.max_items = max(1, max_items)
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        self.counts = {"requests": 0, "batches": 0, "batched_items": 0, "single_calls": 0, "fallbacks": 0}
+
+    async def analyze(self, text: str) -> Union[Dict, str]:
+        """Grammar result for text: a parsed dict from a batch, or the raw response of a single call."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.counts["requests"] += 1
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Owned by the batcher, so a caller giving up does not cancel the others' call
+            task = asyncio.create_task(self._run(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        batch = [(text, future) for text, future in batch if not future.done()]
+        if not batch:
+            return
+        if len(batch) == 1:
+            await self._single(*batch[0])
+            return
+
+        self.counts["batches"] += 1
+        self.counts["batched_items"] += len(batch)
+        try:
+            response = await chat_completion(
+                "grammar_batch",
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": build_batch_input([text for text, _ in batch])},
+                ],
+            )
+            results = split_batch_response(response, len(batch))
+        except Exception as e:
+            logger.error(f"Batched grammar call for {len(batch)} texts failed, falling back to single calls: {e}")
+            results = [None] * len(batch)
+
+        retries = []
+        for (text, future), result in zip(batch, results):
+            if result is None:
+                self.counts["fallbacks"] += 1
+                retries.append(self._single(text, future))
+            elif not future.done():
+                future.set_result(result)
+        if retries:
+            await asyncio.gather(*retries)
+
+    async def _single(self, text: str, future: asyncio.Future) -> None:
+        self.counts["single_calls"] += 1
+        try:
+            response = await self.single_call(text)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(response)
+
+    def stats(self) -> Dict:
+        return {
+            "window_seconds": self.window_seconds,
+            "max_items": self.max_items,
+            "pending": len(self._pending),
+            **self.counts,
+        }
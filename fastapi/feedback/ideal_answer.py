@@ -1,7 +1,10 @@
 import os
-from groq import Groq
 from typing import Dict, Optional
 from fastapi import HTTPException
+from config.settings import LLM_COMBINED_MODE
+from llmClient import chat_completion, task_settings
+from responseCache import llm_cache, make_key
+from .combined_analysis import analyze_combined
 import unicodedata
 import json
 import logging
@@ -9,13 +12,10 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class IdealAnswerGenerator:
-    def __init__(self):
-        self.client = Groq(
-            api_key="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",
-        )
-        self.model = "meta-llama/llama-4-scout-17b-16e-instruct"
+# Bump whenever the ideal-answer prompt changes so cached responses are not reused
+IDEAL_ANSWER_PROMPT_VERSION = "1"
 
+class IdealAnswerGenerator:
     @staticmethod
     def parse_llm_response(response: str) -> Dict:
         """Parse and validate LLM response with unicode support and JSON extraction."""
@@ -67,6 +67,16 @@ class IdealAnswerGenerator:
             Dict: Contains parsed ideal answer analysis
         """
         try:
+            if LLM_COMBINED_MODE:
+                combined = await analyze_combined(question, user_answer)
+                if combined is not None:
+                    return combined["ideal_answer"]
+
+            cache_key = make_key("ideal_answer", task_settings("ideal_answer")["model"], IDEAL_ANSWER_PROMPT_VERSION, question, user_answer)
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             prompt = f"""
             Question: {question}
             User's Answer: {user_answer}
@@ -84,7 +94,8 @@ class IdealAnswerGenerator:
             }}
             """
 
-            chat_completion = self.client.chat.completions.create(
+            response = await chat_completion(
+                "ideal_answer",
                 messages=[
                     {
                         "role": "system",
@@ -95,11 +106,8 @@ class IdealAnswerGenerator:
                         "content": prompt,
                     }
                 ],
-                temperature=0.1,
-                model=self.model,
-            )            
+            )
     
-            response = chat_completion.choices[0].message.content
             logger.info(f"LLM raw response: {response[:200]}")
             
             # Parse JSON response (handles wrapped responses too)
@@ -107,10 +115,12 @@ class IdealAnswerGenerator:
             
             logger.info(f"Parsed ideal answer successfully")
             
-            return {
+            result = {
                 "status": "success",
                 "data": parsed_data  # ✅ Return parsed dict, not string
             }
+            await llm_cache.set(cache_key, result)
+            return result
 
         except HTTPException:
             raise
@@ -0,0 +1,118 @@
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+import numpy as np
+from config.settings import ANALYSIS_PROCESS_WORKERS, ANALYSIS_PROCESS_START_METHOD
+import profiler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+# One in-flight job per worker, so waiting jobs do not hold shared memory copies of their audio
+_slots: Optional[asyncio.Semaphore] = None
+
+def _warm_worker() -> None:
+    """Process initializer: import librosa and compile its numba paths before the first job."""
+    import librosa
+    from .audio_utils import frame_params
+    frame_length, hop_length = frame_params(16000)
+    silence = np.zeros(4096, dtype=np.float32)
+    librosa.feature.rms(y=silence, frame_length=frame_length, hop_length=hop_length)
+    librosa.times_like(np.zeros(8), sr=16000, hop_length=hop_length)
+
+def _ping() -> bool:
+    return True
+
+def _run_on_shared_samples(func: Callable, name: str, length: int, sample_rate: int, kwargs: dict) -> tuple:
+    """
+    Worker side of run_on_samples: view the parent's buffer without copying it through the pipe.
+    Returns func's result and the CPU time the worker spent on it.
+    """
+    # Workers share the parent's resource tracker; the parent unlinks the segment
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        cpu_started = time.process_time()
+        result = func(np.ndarray((length,), dtype=np.float32, buffer=shm.buf), sample_rate, **kwargs)
+        return result, time.process_time() - cpu_started
+    finally:
+        shm.close()
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """The shared analysis process pool, or None when ANALYSIS_PROCESS_WORKERS is 0."""
+    global _executor
+    if _executor is None and ANALYSIS_PROCESS_WORKERS > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=ANALYSIS_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context(ANALYSIS_PROCESS_START_METHOD),
+            initializer=_warm_worker,
+        )
+        logger.info(f"Started analysis process pool with {ANALYSIS_PROCESS_WORKERS} workers")
+    return _executor
+
+async def warm_up() -> None:
+    """Start every worker now so the first requests do not pay for process start and imports."""
+    executor = get_executor()
+    if executor is None:
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(ANALYSIS_PROCESS_WORKERS)))
+        logger.info("Analysis process pool warmed up")
+    except Exception as e:
+        logger.error(f"Error warming up analysis process pool: {e}")
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def run_on_samples(func: Callable, samples: np.ndarray, sample_rate: int, **kwargs) -> Any:
+    """
+    Run func(samples, sample_rate, **kwargs) in the analysis process pool.
+
+    The samples are copied once into a shared memory segment that the worker maps,
+    instead of being pickled. func must be a module-level function. Without a pool
+    (or if the pool has broken) func runs in a thread instead.
+
+    Args:
+        func (Callable): CPU-bound analyzer taking (samples, sample_rate)
+        samples (np.ndarray): Mono audio
+        sample_rate (int): Sample rate of samples
+
+    Returns:
+        Whatever func returns
+    """
+    executor = get_executor()
+    if executor is None:
+        return await asyncio.to_thread(func, samples, sample_rate, **kwargs)
+
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(ANALYSIS_PROCESS_WORKERS)
+
+    samples = np.ascontiguousarray(samples, dtype=np.float32)
+    async with _slots:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, samples.nbytes))
+        try:
+            np.ndarray(samples.shape, dtype=np.float32, buffer=shm.buf)[:] = samples
+            loop = asyncio.get_running_loop()
+            result, worker_cpu = await loop.run_in_executor(
+                executor, _run_on_shared_samples, func, shm.name, len(samples), sample_rate, kwargs
+            )
+            # Not part of this process's CPU time, so report it separately
+            profiler.annotate(worker_cpu_s=round(worker_cpu, 6), shared_bytes=samples.nbytes)
+            return result
+        except BrokenProcessPool:
+            logger.error("Analysis process pool is broken, restarting it and running in a thread")
+            shutdown()
+            return await asyncio.to_thread(func, samples, sample_rate, **kwargs)
+        finally:
+            shm.close()
+            shm.unlink()
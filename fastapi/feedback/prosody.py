@@ -0,0 +1,181 @@
+import logging
+from typing import Dict, List
+import numpy as np
+from config.settings import ANALYSIS_FRAME_SECONDS, ANALYSIS_HOP_SECONDS
+from .audio_utils import frame_params
+from .get_pause import find_silent_runs
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pitch search range of adult speech, and the normalized autocorrelation a voiced frame reaches
+MIN_PITCH_HZ = 70.0
+MAX_PITCH_HZ = 400.0
+VOICING_THRESHOLD = 0.5
+OCTAVE_TOLERANCE = 0.9
+# Frames per FFT batch, so long recordings do not materialize every frame at once
+PITCH_BLOCK_FRAMES = 512
+
+# (low, ideal low, ideal high, high) bands scored 1 inside the ideal range, falling to 0 at low and high
+SPEECH_RATE_BAND = (60.0, 110.0, 170.0, 240.0)    # words per minute
+PITCH_STD_BAND = (0.0, 2.0, 6.0, 10.0)            # semitones
+ENERGY_STD_BAND = (0.0, 3.0, 10.0, 16.0)          # dB
+SCORE_WEIGHTS = {"rate": 0.4, "pitch": 0.3, "energy": 0.3}
+
+def _band_score(value: float, band) -> float:
+    low, ideal_low, ideal_high, high = band
+    if value < ideal_low:
+        return float(np.clip((value - low) / (ideal_low - low), 0.0, 1.0))
+    if value > ideal_high:
+        return float(np.clip((high - value) / (high - ideal_high), 0.0, 1.0))
+    return 1.0
+
+def frame_rms(audio: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    RMS of centered, zero-padded frames, matching librosa.feature.rms, from a running sum
+    of squares so each sample is touched once whatever the frame overlap.
+    """
+    pad = frame_length // 2
+    squares = np.concatenate((np.zeros(pad), np.square(audio, dtype=np.float64), np.zeros(pad)))
+    cumulative = np.concatenate(([0.0], np.cumsum(squares)))
+    starts = np.arange(1 + (len(squares) - frame_length) // hop_length) * hop_length
+    power = (cumulative[starts + frame_length] - cumulative[starts]) / frame_length
+    return np.sqrt(np.maximum(power, 0.0))
+
+def frame_pitch(audio: np.ndarray, sample_rate: int, centers: np.ndarray, frame_length: int) -> np.ndarray:
+    """
+    Autocorrelation pitch (Hz) of the frames centered on the given samples, NaN where unvoiced.
+    Frames are windowed and correlated through one batched FFT per block.
+    """
+    # scipy's FFT keeps float32 and handles non power of two lengths, several times faster than numpy's here
+    import scipy.fft
+
+    min_lag = max(1, int(sample_rate / MAX_PITCH_HZ))
+    max_lag = min(frame_length - 1, int(np.ceil(sample_rate / MIN_PITCH_HZ)))
+    pitches = np.full(len(centers), np.nan)
+    if min_lag >= max_lag or not len(centers):
+        return pitches
+
+    pad = frame_length // 2
+    padded = np.concatenate((np.zeros(pad, np.float32), audio.astype(np.float32, copy=False), np.zeros(pad, np.float32)))
+    frames_view = np.lib.stride_tricks.sliding_window_view(padded, frame_length)
+    window = np.hanning(frame_length).astype(np.float32)
+    # Long enough that lags up to max_lag do not wrap around
+    n_fft = scipy.fft.next_fast_len(frame_length + max_lag + 1, real=True)
+    # Autocorrelation of the window itself, to undo the taper's bias towards short lags
+    window_acf = scipy.fft.irfft(np.abs(scipy.fft.rfft(window, n_fft)) ** 2, n_fft)[:max_lag + 1]
+    lags = np.arange(min_lag, max_lag + 1)
+
+    for first in range(0, len(centers), PITCH_BLOCK_FRAMES):
+        block = centers[first:first + PITCH_BLOCK_FRAMES]
+        frames = frames_view[block] * window
+        frames -= frames.mean(axis=1, keepdims=True)
+        spectrum = scipy.fft.rfft(frames, n_fft, axis=1)
+        acf = scipy.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n_fft, axis=1)[:, :max_lag + 1]
+        energy = acf[:, :1]
+        normalized = acf[:, min_lag:] / np.maximum(energy, 1e-12) / window_acf[min_lag:] * window_acf[0]
+        # The shortest-lag peak close to the highest one, since multiples of the period correlate too
+        peaks = np.zeros(normalized.shape, dtype=bool)
+        peaks[:, 1:-1] = (normalized[:, 1:-1] >= normalized[:, :-2]) & (normalized[:, 1:-1] >= normalized[:, 2:])
+        peaks &= normalized >= OCTAVE_TOLERANCE * normalized.max(axis=1, keepdims=True)
+        best = np.where(peaks.any(axis=1), np.argmax(peaks, axis=1), np.argmax(normalized, axis=1))
+        strength = normalized[np.arange(len(block)), best]
+        voiced = (strength >= VOICING_THRESHOLD) & (energy[:, 0] > 0)
+        pitches[first:first + len(block)] = np.where(voiced, sample_rate / lags[best], np.nan)
+    return pitches
+
+def analyze_prosody(audio: np.ndarray, sample_rate: int, word_count: int, threshold_seconds=0.8, amplitude_threshold=0.015,
+                    frame_seconds: float = ANALYSIS_FRAME_SECONDS, hop_seconds: float = ANALYSIS_HOP_SECONDS) -> Dict:
+    """
+    Speech rate, articulation rate, energy dynamics and pitch variability of a mono buffer.
+
+    Pauses are found with the same envelope, thresholds and detector as get_pause_count, so
+    the articulation rate excludes exactly the pauses reported by the pause analysis. Energy
+    and pitch are measured over the frames above amplitude_threshold only.
+
+    Args:
+        audio (np.ndarray): Mono samples
+        sample_rate (int): Sample rate of audio
+        word_count (int): Words in the transcript of the recording
+
+    Returns:
+        Dict: the measurements, a 0-100 score and tips for the feedback
+    """
+    duration = len(audio) / sample_rate
+    peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+    if peak == 0 or word_count <= 0:
+        return {"score": 0, "tips": [], "audio_duration": round(duration, 2), "error": "No speech found in audio"}
+    audio = audio / peak
+
+    frame_length, hop_length = frame_params(sample_rate, frame_seconds, hop_seconds)
+    envelope = frame_rms(audio, frame_length, hop_length)
+    times = np.arange(len(envelope)) * hop_length / sample_rate
+
+    start_times, end_times, durations = find_silent_runs(envelope, times, amplitude_threshold, threshold_seconds)
+    speech = envelope >= amplitude_threshold
+    if not speech.any():
+        return {"score": 0, "tips": [], "audio_duration": round(duration, 2), "error": "No speech found in audio"}
+
+    # Rates over the span from the first to the last speech frame, so lead-in silence is not counted
+    speech_frames = np.flatnonzero(speech)
+    span = max(times[speech_frames[-1]] - times[speech_frames[0]], hop_seconds)
+    inner = (start_times > times[speech_frames[0]]) & (end_times < times[speech_frames[-1]])
+    articulation_time = max(span - float(durations[inner].sum()), hop_seconds)
+    speech_rate = float(word_count / span * 60)
+    articulation_rate = float(word_count / articulation_time * 60)
+
+    energy_db = 20 * np.log10(envelope[speech])
+    energy_std = float(energy_db.std())
+    energy_range = float(np.percentile(energy_db, 95) - np.percentile(energy_db, 10))
+
+    pitches = frame_pitch(audio, sample_rate, speech_frames * hop_length, frame_length)
+    voiced = pitches[~np.isnan(pitches)]
+    pitch_mean = pitch_std = pitch_range = None
+    if len(voiced) >= 2:
+        semitones = 12 * np.log2(voiced / np.median(voiced))
+        # Octave jumps of the tracker are errors, not intonation
+        semitones = semitones[np.abs(semitones) < 12]
+        pitch_mean = float(np.median(voiced))
+        pitch_std = float(semitones.std())
+        pitch_range = float(np.percentile(semitones, 90) - np.percentile(semitones, 10))
+
+    components = {
+        "rate": _band_score(speech_rate, SPEECH_RATE_BAND),
+        "pitch": _band_score(pitch_std, PITCH_STD_BAND) if pitch_std is not None else 0.0,
+        "energy": _band_score(energy_std, ENERGY_STD_BAND),
+    }
+    score = int(round(100 * sum(SCORE_WEIGHTS[name] * value for name, value in components.items())))
+
+    tips: List[str] = []
+    if speech_rate > SPEECH_RATE_BAND[2]:
+        tips.append(f"You spoke quickly ({speech_rate:.0f} words per minute); slow down slightly so every word is heard clearly.")
+    elif speech_rate < SPEECH_RATE_BAND[1]:
+        tips.append(f"Your pace was slow ({speech_rate:.0f} words per minute); try to speak a little more continuously.")
+    if pitch_std is None or pitch_std < PITCH_STD_BAND[1]:
+        tips.append("Your intonation was quite flat; vary your pitch to stress key words and mark questions.")
+    elif pitch_std > PITCH_STD_BAND[2]:
+        tips.append("Your pitch varied a lot; keep intonation steadier outside the words you want to stress.")
+    if energy_std < ENERGY_STD_BAND[1]:
+        tips.append("Your volume stayed very even; emphasize important words to sound more engaging.")
+    elif energy_std > ENERGY_STD_BAND[2]:
+        tips.append("Your volume was uneven; keep a steady level so quieter words are not lost.")
+
+    result = {
+        "score": score,
+        "tips": tips,
+        "audio_duration": round(duration, 2),
+        "speaking_time": round(float(span), 2),
+        "articulation_time": round(float(articulation_time), 2),
+        "speech_rate_wpm": round(speech_rate, 1),
+        "articulation_rate_wpm": round(articulation_rate, 1),
+        "energy_mean_db": round(float(energy_db.mean()), 1),
+        "energy_std_db": round(energy_std, 1),
+        "energy_range_db": round(energy_range, 1),
+        "voiced_ratio": round(len(voiced) / len(pitches), 2),
+        "pitch_mean_hz": round(pitch_mean, 1) if pitch_mean is not None else None,
+        "pitch_std_semitones": round(pitch_std, 2) if pitch_std is not None else None,
+        "pitch_range_semitones": round(pitch_range, 2) if pitch_range is not None else None,
+        "components": {name: round(value, 2) for name, value in components.items()},
+    }
+    logger.info(f"Prosody: {speech_rate:.0f} wpm, pitch std {pitch_std}, energy std {energy_std:.1f} dB, score {score}")
+    return result
@@ -1,67 +1,62 @@
+import os
+import re
+import json
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
+from config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Advanced vocabulary words categorized by type
-ADVANCED_VOCABULARY = {
-    "verbs": {
-        "accomplish", "acquire", "advocate", "analyze", "assess", "collaborate",
-        "comprehend", "contemplate", "demonstrate", "derive", "elaborate",
-        "emphasize", "enhance", "establish", "evaluate", "facilitate",
-        "generate", "implement", "incorporate", "investigate", "maintain",
-        "optimize", "perceive", "pursue", "resolve", "synthesize", "utilize",
-        "articulate", "cultivate", "differentiate", "exemplify", "formulate",
-        "hypothesize", "integrate", "leverage", "mediate", "navigate",
-        "orchestrate", "quantify", "rationalize", "streamline", "validate"
-    },
-    "adjectives": {
-        "abundant", "adequate", "comprehensive", "crucial", "diverse",
-        "efficient", "fundamental", "innovative", "integral", "optimal",
-        "precise", "prominent", "robust", "significant", "sophisticated",
-        "substantial", "versatile", "analytical", "cohesive", "empirical",
-        "holistic", "imperative", "methodical", "nuanced", "paramount",
-        "pragmatic", "quintessential", "systematic", "theoretical"
-    },
-    "adverbs": {
-        "accordingly", "consequently", "effectively", "extensively",
-        "fundamentally", "predominantly", "precisely", "primarily",
-        "significantly", "substantially", "thoroughly", "analytically",
-        "coherently", "decisively", "empirically", "intrinsically",
-        "methodically", "objectively", "pragmatically", "strategically"
-    },
-    "transitions": {
-        "additionally", "consequently", "furthermore", "however",
-        "moreover", "nevertheless", "subsequently", "therefore",
-        "alternatively", "comparatively", "conversely", "correspondingly",
-        "essentially", "ultimately", "notwithstanding", "similarly",
-        "specifically", "whereas"
-    },
-    "academic": {
-        "analysis", "approach", "concept", "context", "data",
-        "evidence", "framework", "hypothesis", "methodology",
-        "perspective", "principle", "process", "research", "theory",
-        "algorithm", "correlation", "discretion", "paradigm",
-        "parameter", "phenomenon", "protocol", "synthesis",
-        "threshold", "variable", "velocity", "criterion"
-    }
-}
+# Lexicon file with advanced words by category and an inflection -> lemma table
+VOCABULARY_FILE = settings.VOCABULARY_FILE or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "vocabulary.json"
+)
+
+# Words are runs of letters, so trailing punctuation ("analyze," or "however.") is stripped
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+def load_vocabulary(path: str = VOCABULARY_FILE) -> Tuple[Dict[str, Set[str]], Dict[str, List[str]], Dict[str, str]]:
+    """
+    Load the lexicon and build the lookup tables.
+
+    Returns:
+        Tuple of (words by category, word -> categories index, inflection -> lemma table)
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    vocabulary = {category: set(words) for category, words in data["categories"].items()}
+    index: Dict[str, List[str]] = {}
+    for category, words in data["categories"].items():
+        for word in words:
+            index.setdefault(word.lower(), []).append(category)
+    lemmas = {form.lower(): lemma.lower() for form, lemma in data.get("inflections", {}).items()}
+
+    logger.info(f"Loaded {len(index)} vocabulary words and {len(lemmas)} inflections from {path}")
+    return vocabulary, index, lemmas
+
+# Advanced vocabulary words categorized by type, plus the precomputed lookup tables
+ADVANCED_VOCABULARY, VOCABULARY_INDEX, LEMMAS = load_vocabulary()
 
 def analyze_vocabulary(text: str) -> Dict:
     """
     Analyze the vocabulary usage in the given text.
+    Single pass over the tokens: each token is mapped to its lemma and looked up in the index.
     """
     try:
-        words = set(text.lower().split())
         found_words = {category: [] for category in ADVANCED_VOCABULARY}
         total_advanced_words = 0
+        seen = set()
         
-        for category, word_set in ADVANCED_VOCABULARY.items():
-            for word in word_set:
-                if word in words:
-                    found_words[category].append(word)
-                    total_advanced_words += 1
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            word = LEMMAS.get(token, token)
+            if word in seen:
+                continue
+            seen.add(word)
+            for category in VOCABULARY_INDEX.get(word, ()):
+                found_words[category].append(word)
+                total_advanced_words += 1
         
         base_score = 50
         max_expected_words = 10
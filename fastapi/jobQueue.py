@@ -0,0 +1,171 @@
+import time
+import uuid
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit when max_queued jobs are already waiting."""
+
+class JobQueue:
+    """
+    In-process job queue with a bounded worker pool.
+
+    submit() stores the job and returns immediately; `concurrency` worker tasks run
+    the handler on queued payloads in order. Finished jobs are kept for ttl_seconds
+    so clients can poll (get) or long-poll (wait) for the result. No outside broker
+    is needed, so the queue can be exercised directly with any async handler.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Dict], Awaitable[Any]],
+        concurrency: int = settings.JOB_WORKERS,
+        max_queued: int = settings.JOB_QUEUE_MAX_LENGTH,
+        ttl_seconds: float = settings.JOB_TTL_SECONDS,
+        name: str = "jobs",
+    ):
+        self.handler = handler
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._jobs: Dict[str, Dict] = {}
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker tasks; called lazily by submit()."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [
+            asyncio.create_task(self._worker(index)) for index in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} workers for {self.name} queue")
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs that have not finished are marked failed."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job_id, job in self._jobs.items():
+            if job["status"] in (JOB_QUEUED, JOB_RUNNING):
+                self._finish(job_id, error="Job queue stopped")
+
+    def submit(self, payload: Dict) -> Dict:
+        """
+        Queue a job.
+
+        Returns:
+            Dict: the job's public state (job_id, status, ...)
+
+        Raises:
+            QueueFullError: if max_queued jobs are already waiting
+        """
+        self.start()
+        self._expire()
+        job_id = uuid.uuid4().hex
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self.name} queue is full ({self.max_queued} jobs waiting)")
+
+        self._jobs[job_id] = {
+            "job_id": job_id,
+            "status": JOB_QUEUED,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "payload": payload,
+            # The submitting request's context, so the job's stage metrics keep its labels
+            "context": contextvars.copy_context(),
+        }
+        self._done_events[job_id] = asyncio.Event()
+        return self._public(self._jobs[job_id])
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Current state of a job, or None if it is unknown or expired."""
+        self._expire()
+        job = self._jobs.get(job_id)
+        return self._public(job) if job else None
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """Long-poll: wait up to timeout seconds for the job to finish, then return its state."""
+        event = self._done_events.get(job_id)
+        if event is None:
+            return self.get(job_id)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.get(job_id)
+
+    def stats(self) -> Dict:
+        counts = {status: 0 for status in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED)}
+        for job in self._jobs.values():
+            counts[job["status"]] += 1
+        return {
+            "workers": len(self._workers),
+            "max_queued": self.max_queued,
+            "queue_length": self._queue.qsize() if self._queue else 0,
+            "jobs": counts,
+        }
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] != JOB_QUEUED:
+                    continue
+                job["status"] = JOB_RUNNING
+                job["started_at"] = time.time()
+                try:
+                    result = await asyncio.create_task(self.handler(job["payload"]), context=job["context"])
+                except Exception as e:
+                    logger.error(f"Job {job_id} failed in {self.name} worker {index}: {str(e)}")
+                    self._finish(job_id, error=str(e))
+                else:
+                    self._finish(job_id, result=result)
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, job_id: str, result: Any = None, error: Optional[str] = None) -> None:
+        job = self._jobs[job_id]
+        job["status"] = JOB_FAILED if error is not None else JOB_DONE
+        job["finished_at"] = time.time()
+        job["result"] = result
+        job["error"] = error
+        job["payload"] = None
+        job["context"] = None
+        self._done_events[job_id].set()
+
+    def _expire(self) -> None:
+        """Drop finished jobs older than ttl_seconds."""
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            del self._done_events[job_id]
+
+    @staticmethod
+    def _public(job: Dict) -> Dict:
+        return {key: value for key, value in job.items() if key not in ("payload", "context")}
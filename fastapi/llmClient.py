@@ -0,0 +1,135 @@
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import httpx
+
+from config import settings
+from llmTransport import Transport, create_transport
+from metrics import track_stage
+import profiler
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Process-wide client, created lazily inside the running event loop
+_client: Optional["AsyncGroq"] = None
+_transport: Optional[Transport] = None
+
+def get_client() -> "AsyncGroq":
+    """Return the shared async Groq client, creating it with a pooled HTTP client on first use."""
+    global _client
+    if _client is None:
+        from groq import AsyncGroq
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
+        _client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            http_client=http_client,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+        logger.info(
+            f"Created shared Groq client (max_connections={settings.LLM_MAX_CONNECTIONS}, "
+            f"keepalive={settings.LLM_MAX_KEEPALIVE_CONNECTIONS})"
+        )
+    return _client
+
+async def close_client() -> None:
+    """Close the shared client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+class LiveTransport(Transport):
+    """Sends calls to Groq with the shared client."""
+
+    async def chat(self, task: str, messages: List[Dict], params: Dict) -> str:
+        response = await get_client().chat.completions.create(messages=messages, **params)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            profiler.annotate(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+        return _extract_content(response)
+
+    async def transcribe(self, file: Tuple[str, bytes], language: str, prompt: Optional[str], params: Dict) -> str:
+        transcription = await get_client().audio.transcriptions.create(
+            file=file,
+            prompt=prompt,
+            response_format="json",
+            language=language,
+            **params
+        )
+        return transcription.text
+
+    def stats(self) -> Dict:
+        return {"mode": "live"}
+
+def get_transport() -> Transport:
+    """Return the transport selected by LLM_TRANSPORT (live, record or replay)."""
+    global _transport
+    if _transport is None:
+        _transport = create_transport(settings.LLM_TRANSPORT, LiveTransport())
+    return _transport
+
+def task_settings(task: str) -> Dict:
+    """Model and sampling parameters configured for a call site."""
+    return dict(settings.LLM_TASKS.get(task, settings.LLM_TASKS["default"]))
+
+def _extract_content(response) -> str:
+    """Pull the message text out of a chat completion, tolerating different response shapes."""
+    try:
+        if hasattr(response, "choices") and response.choices:
+            choice0 = response.choices[0]
+            # support .message.content or .text depending on SDK
+            content = getattr(getattr(choice0, "message", None), "content", None) or getattr(choice0, "text", None)
+            if content:
+                return content
+        return str(response)
+    except Exception:
+        return str(response)
+
+async def chat_completion(task: str, messages: List[Dict], **overrides) -> str:
+    """
+    Run a chat completion for the given call site and return the message text.
+
+    Args:
+        task (str): Call site name, key into settings.LLM_TASKS
+        messages (List[Dict]): Chat messages
+        **overrides: Per-call parameters that replace the configured ones
+
+    Returns:
+        str: Content of the first choice
+    """
+    params = task_settings(task)
+    params.update(overrides)
+    async with track_stage(task, model=params.get("model", "")):
+        content = await get_transport().chat(task, messages, params)
+        # Characters as well as tokens, since replayed calls carry no token usage
+        profiler.annotate(prompt_chars=sum(len(str(m.get("content", ""))) for m in messages), response_chars=len(content))
+        return content
+
+async def transcribe(file: Tuple[str, bytes], language: str, prompt: Optional[str] = None, **overrides) -> str:
+    """
+    Transcribe audio with the configured transcription model.
+
+    Args:
+        file (Tuple[str, bytes]): Filename and raw audio bytes
+        language (str): ISO language code
+        prompt (str): Optional prompt to steer the transcription
+
+    Returns:
+        str: Transcribed text
+    """
+    params = task_settings("transcription")
+    params.update(overrides)
+    async with track_stage("transcription", model=params.get("model", "")):
+        profiler.annotate(audio_bytes_sent=len(file[1]))
+        return await get_transport().transcribe(file, language, prompt, params)
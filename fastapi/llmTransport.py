@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class InjectedLLMError(Exception):
+    """Failure injected by ReplayTransport to simulate provider errors."""
+
+class CassetteMissError(Exception):
+    """No recorded response matches a replayed request."""
+
+class Transport(ABC):
+    """
+    Carries LLM and transcription calls for llmClient.
+
+    chat() and transcribe() receive the call site (task), the request and the
+    resolved model parameters, and return the response text. Both are abstract,
+    so a transport missing one fails when it is created rather than mid-request.
+    """
+
+    @abstractmethod
+    async def chat(self, task: str, messages: List[Dict], params: Dict) -> str:
+        ...
+
+    @abstractmethod
+    async def transcribe(self, file: Tuple[str, bytes], language: str, prompt: Optional[str], params: Dict) -> str:
+        ...
+
+    def stats(self) -> Dict:
+        return {}
+
+def chat_key(task: str, messages: List[Dict], params: Dict) -> str:
+    payload = json.dumps({"task": task, "messages": messages, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def transcription_key(audio_sha256: str, language: str, prompt: Optional[str], params: Dict) -> str:
+    payload = json.dumps({"audio": audio_sha256, "language": language, "prompt": prompt, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class Cassette:
+    """Recorded request/response pairs, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict] = []
+        self.by_key: Dict[str, List[Dict]] = {}
+        self.by_task: Dict[str, List[Dict]] = {}
+        self._write_lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+            logger.info(f"Loaded {len(self.entries)} recorded LLM responses from {path}")
+
+    def _index(self, entry: Dict) -> None:
+        self.entries.append(entry)
+        self.by_key.setdefault(entry["key"], []).append(entry)
+        self.by_task.setdefault(entry["task"], []).append(entry)
+
+    async def append(self, entry: Dict) -> None:
+        """Index entry at once and write it to the file in a thread, off the event loop."""
+        self._index(entry)
+        await asyncio.to_thread(self._write, json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _write(self, line: str) -> None:
+        # One whole line per write under the lock, so concurrent requests do not interleave entries
+        with self._write_lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+class RecordingTransport(Transport):
+    """Forwards calls to another transport and saves every successful response to a cassette."""
+
+    def __init__(self, inner: Transport, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self.recorded = 0
+
+    async def chat(self, task: str, messages: List[Dict], params: Dict) -> str:
+        started = time.perf_counter()
+        response = await self.inner.chat(task, messages, params)
+        await self._record({
+            "kind": "chat",
+            "task": task,
+            "key": chat_key(task, messages, params),
+            "model": params.get("model"),
+            "request": {"messages": messages, "params": params},
+            "response": response,
+            "latency_s": time.perf_counter() - started,
+        })
+        return response
+
+    async def transcribe(self, file: Tuple[str, bytes], language: str, prompt: Optional[str], params: Dict) -> str:
+        started = time.perf_counter()
+        response = await self.inner.transcribe(file, language, prompt, params)
+        audio_sha256 = hashlib.sha256(file[1]).hexdigest()
+        await self._record({
+            "kind": "transcription",
+            "task": "transcription",
+            "key": transcription_key(audio_sha256, language, prompt, params),
+            "model": params.get("model"),
+            # Audio is identified by its hash; the bytes are not stored
+            "request": {"filename": file[0], "audio_sha256": audio_sha256, "audio_bytes": len(file[1]),
+                        "language": language, "prompt": prompt, "params": params},
+            "response": response,
+            "latency_s": time.perf_counter() - started,
+        })
+        return response
+
+    async def _record(self, entry: Dict) -> None:
+        entry["recorded_at"] = time.time()
+        await self.cassette.append(entry)
+        self.recorded += 1
+
+    def stats(self) -> Dict:
+        return {"mode": "record", "recorded": self.recorded, "cassette_entries": len(self.cassette.entries)}
+
+class LatencyModel:
+    """
+    Latency distribution for replayed calls, parsed from a spec string:
+
+        recorded              the latency measured when the response was recorded
+        fixed:S               always S seconds
+        uniform:LOW,HIGH      uniform between LOW and HIGH seconds
+        normal:MEAN,STDEV     normal, clipped at 0
+        lognormal:MEDIAN,SIGMA  log-normal with the given median; SIGMA sets the tail
+
+    A trailing "xF" scales the result, e.g. "recorded x0.5" or "lognormal:0.8,0.6 x2".
+    """
+
+    def __init__(self, spec: str, rng: random.Random):
+        self.spec = spec
+        self.rng = rng
+        spec, _, scale = spec.strip().partition(" x")
+        self.scale = float(scale) if scale else 1.0
+        self.kind, _, args = spec.partition(":")
+        self.args = [float(arg) for arg in args.split(",")] if args else []
+        if self.kind not in ("recorded", "fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {self.spec}")
+
+    def sample(self, recorded: float) -> float:
+        if self.kind == "recorded":
+            value = recorded
+        elif self.kind == "fixed":
+            value = self.args[0]
+        elif self.kind == "uniform":
+            value = self.rng.uniform(self.args[0], self.args[1])
+        elif self.kind == "normal":
+            value = self.rng.gauss(self.args[0], self.args[1])
+        else:
+            value = self.rng.lognormvariate(0, self.args[1]) * self.args[0]
+        return max(0.0, value * self.scale)
+
+class ReplayTransport(Transport):
+    """
+    Serves recorded responses without calling the provider.
+
+    Requests are matched by exact key first. With match="task", a request that was
+    never recorded gets a recorded response of the same call site (picked by its key,
+    so the same request always gets the same response), which lets load tests use
+    new transcripts. Each call waits for a latency drawn from the configured
+    distribution and fails with probability error_rate.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: str = settings.LLM_REPLAY_LATENCY,
+        transcription_latency: Optional[str] = settings.LLM_REPLAY_TRANSCRIPTION_LATENCY,
+        error_rate: float = settings.LLM_REPLAY_ERROR_RATE,
+        match: str = settings.LLM_REPLAY_MATCH,
+        seed: Optional[int] = settings.LLM_REPLAY_SEED,
+    ):
+        self.cassette = cassette
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.transcription_latency = LatencyModel(transcription_latency or latency, self.rng)
+        self.error_rate = error_rate
+        self.match = match
+        self.counts = {"calls": 0, "exact_hits": 0, "task_matches": 0, "misses": 0, "injected_errors": 0}
+
+    def _lookup(self, task: str, key: str) -> Dict:
+        entries = self.cassette.by_key.get(key)
+        if entries:
+            self.counts["exact_hits"] += 1
+            return entries[-1]
+        entries = self.cassette.by_task.get(task) if self.match == "task" else None
+        if entries:
+            self.counts["task_matches"] += 1
+            return entries[int(key, 16) % len(entries)]
+        self.counts["misses"] += 1
+        raise CassetteMissError(f"No recorded {task} response for request {key[:12]}")
+
+    async def _replay(self, task: str, key: str, latency: LatencyModel) -> str:
+        self.counts["calls"] += 1
+        entry = self._lookup(task, key)
+        await asyncio.sleep(latency.sample(entry.get("latency_s", 0.0)))
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.counts["injected_errors"] += 1
+            raise InjectedLLMError(f"Injected {task} failure")
+        return entry["response"]
+
+    async def chat(self, task: str, messages: List[Dict], params: Dict) -> str:
+        return await self._replay(task, chat_key(task, messages, params), self.latency)
+
+    async def transcribe(self, file: Tuple[str, bytes], language: str, prompt: Optional[str], params: Dict) -> str:
+        key = transcription_key(hashlib.sha256(file[1]).hexdigest(), language, prompt, params)
+        return await self._replay("transcription", key, self.transcription_latency)
+
+    def stats(self) -> Dict:
+        return {
+            "mode": "replay",
+            "cassette_entries": len(self.cassette.entries),
+            "latency": self.latency.spec,
+            "transcription_latency": self.transcription_latency.spec,
+            "error_rate": self.error_rate,
+            **self.counts,
+        }
+
+def create_transport(mode: str, live: Transport, cassette_path: str = settings.LLM_CASSETTE_PATH) -> Transport:
+    """Build the transport for LLM_TRANSPORT: "live", "record" or "replay"."""
+    if mode == "live":
+        return live
+    if mode == "record":
+        logger.info(f"Recording LLM calls to {cassette_path}")
+        return RecordingTransport(live, Cassette(cassette_path))
+    if mode == "replay":
+        logger.info(f"Replaying LLM calls from {cassette_path}")
+        return ReplayTransport(Cassette(cassette_path))
+    raise ValueError(f"Unknown LLM_TRANSPORT: {mode}")
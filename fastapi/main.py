@@ -1,14 +1,32 @@
-from fastapi import FastAPI, UploadFile, File, Body, HTTPException, Form
+import time
+# Start of the app's imports, for the startup timing log
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, UploadFile, File, Body, HTTPException, Form, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from routers import users
 from config.database import init_db
 from feedback.feedback_processor import FeedbackProcessor
+from feedback import process_pool
 from feedback.check_correctness import check_answer_correctness
 from feedback.ideal_answer import IdealAnswerGenerator
-from setupGeneration import generate_assessment_questions
+from setupGeneration import generate_assessment_questions, AssessmentSetup
+from questionPool import question_pool
+from llmClient import close_client
+from responseCache import llm_cache
+from config import settings
+from assessmentBatch import score_assessment
+from jobQueue import JobQueue, QueueFullError
+import metrics
+import profiler
+import warmup
 import logging
 import os
-from audioProcessor import process_audio_file
+import json
+import asyncio
+from audioProcessor import process_audio_file, save_upload, resolve_audio_handle, transcription_cache, LANGUAGE_CODES
 from typing import Dict, List,Optional
 import types
 from pydantic import BaseModel, validator
@@ -25,24 +43,22 @@ logger = logging.getLogger(__name__)
 class TextAnalysisRequest(BaseModel):
     text: str
     question: Optional[str] = None
+    language: Optional[str] = "English"
+    audio_id: Optional[str] = None
     audio_file: Optional[str] = None
 
     @validator('audio_file')
     def validate_audio_file(cls, v):
-        if v and not os.path.exists(v):
-            if os.path.exists(os.path.join('temp_audio', os.path.basename(v))):
-                return os.path.join('temp_audio', os.path.basename(v))
-        return v
+        # Only ever a file name under UPLOAD_DIR, never a path chosen by the client
+        return os.path.basename(v) if v else v
 
 app = FastAPI()
 
 API_FRONTEND_URL = os.getenv("API_FRONTEND_URL")
 
-class TempFileManager:
-    def __init__(self):
-        self.temp_file_path = ""
+# Room for multipart boundaries and form fields on top of the file itself
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
 
-temp_file_manager = TempFileManager()
 ideal_answer_generator = IdealAnswerGenerator()
 
 app.add_middleware(
@@ -56,69 +72,292 @@ app.add_middleware(
 # Initialize FeedbackProcessor
 feedback_processor = FeedbackProcessor()
 
+async def run_audio_job(payload: Dict) -> Dict:
+    """Transcribe a saved upload and, when a question is given, analyze the answer."""
+    transcription = await process_audio_file(payload["path"], payload["language"], audio_hash=payload["sha256"])
+    if transcription.get("status") != "success":
+        raise RuntimeError(transcription.get("message", "Transcription failed"))
+
+    result = {"transcription": transcription, "feedback": None}
+    if payload.get("question"):
+        feedback = await feedback_processor.analyze_text(
+            text=transcription["text"],
+            question=payload["question"],
+            tempFileName=payload["path"],
+            language=payload["language"]
+        )
+        if "error" in feedback:
+            raise RuntimeError(feedback["error"])
+        result["feedback"] = feedback
+    return result
+
+audio_jobs = JobQueue(run_audio_job, name="audio")
+
+@app.middleware("http")
+async def reject_oversized_requests(request: Request, call_next):
+    # Reject before the body is parsed when the client announces an oversized upload
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_BYTES + UPLOAD_OVERHEAD_BYTES:
+        return JSONResponse(
+            status_code=413,
+            content={"status": "error", "message": f"Upload exceeds the maximum size of {settings.MAX_UPLOAD_BYTES} bytes"}
+        )
+    return await call_next(request)
+
+metrics.configure_languages(LANGUAGE_CODES)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # Whole-request latency; endpoints add their language with metrics.set_language
+    labels = metrics.start_request(request.scope)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except BaseException:
+        metrics.observe_request(labels, request.method, 500, time.perf_counter() - started)
+        raise
+
+    # Observed once the body has been sent, so streamed responses (/analyze-text/stream)
+    # count until their last event rather than until their headers
+    body_iterator = response.body_iterator
+
+    async def observed_body():
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            metrics.observe_request(labels, request.method, response.status_code, time.perf_counter() - started)
+
+    response.body_iterator = observed_body()
+    return response
+
+# Endpoints that attach a timing tree to their response when profiling is requested
+PROFILED_PATHS = {"/analyze-text", "/process-audio", "/generate-questions"}
+
+def requested_profile_mode(request: Request) -> Optional[str]:
+    """ "timing", "sample" or None, from the X-Profile header or the profile query parameter."""
+    if not settings.PROFILING_ENABLED or request.url.path not in PROFILED_PATHS:
+        return None
+    value = (request.headers.get("x-profile") or request.query_params.get("profile") or "").lower()
+    if value == "sample" and settings.PROFILING_SAMPLER_ENABLED:
+        return "sample"
+    if value in ("1", "true", "yes", "sample"):
+        return "timing"
+    return None
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    mode = requested_profile_mode(request)
+    if mode is None:
+        return await call_next(request)
+
+    root = profiler.start_profile(f"{request.method} {request.url.path}")
+    sampler = None
+    if mode == "sample":
+        root.attributes["flamegraph"] = profiler.new_sample_path(settings.PROFILING_OUTPUT_DIR)
+        sampler = profiler.StackSampler(root.attributes["flamegraph"], settings.PROFILING_SAMPLE_INTERVAL_SECONDS).start()
+    try:
+        return await call_next(request)
+    finally:
+        if sampler is not None:
+            samples = await asyncio.to_thread(sampler.stop)
+            logger.info(f"Wrote {samples} stack samples to {sampler.path}")
+
+@app.on_event("startup")
+async def startup() -> None:
+    # Spawn the analysis workers and compile the audio paths in the background; see /ready
+    app.state.warmup = warmup.start(IMPORT_SECONDS)
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await audio_jobs.stop()
+    process_pool.shutdown()
+    # Release pooled LLM connections
+    await close_client()
+
 @app.get("/", tags=["root"])
 async def read_root() -> dict:
     return {"message": "Welcome to your new project!"}
 
 @app.post("/process-audio") 
 async def process_audio(file: UploadFile = File(...), language: str = Form(default="English")):
+    metrics.set_language(language)
     try:
-        # Create a temporary directory if it doesn't exist
-
-       
-        temp_dir = "temp_audio"
-        os.makedirs(temp_dir, exist_ok=True)
-        # Save the uploaded file temporarily
-        temp_file_path = os.path.join(temp_dir, file.filename)
-
-        logger.info(f"Saving audio file to {temp_file_path}")
-
-        
-        temp_file_manager.temp_file_path = temp_file_path
-
-        with open(temp_file_path, "wb") as buffer:
-            contents = await file.read()
-            buffer.write(contents)
+        # Stream the upload to its own file so concurrent requests never share a path
+        upload = await save_upload(file)
         
         # Process the audio file (now includes fluency analysis)
-        result = await process_audio_file(temp_file_path, language)
+        result = await process_audio_file(upload["path"], language, audio_hash=upload["sha256"])
         
         # Clean up the temporary file
         # os.remove(temp_file_path)
         
         # Return the processing result (includes transcription and fluency data)
-        return result
+        return profiler.attach(result)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing audio: {str(e)}")
         return {"status": "error", "message": str(e)}
 
+@app.post("/jobs/process-audio", status_code=202)
+async def submit_audio_job(
+    file: UploadFile = File(...),
+    language: str = Form(default="English"),
+    question: Optional[str] = Form(default=None)
+):
+    """
+    Queue an upload for transcription (and analysis, when a question is given).
+    Returns a job id immediately; poll /jobs/{job_id} or long-poll /jobs/{job_id}/wait.
+    """
+    metrics.set_language(language)
+    upload = await save_upload(file)
+    try:
+        job = audio_jobs.submit({
+            "path": upload["path"],
+            "sha256": upload["sha256"],
+            "language": language,
+            "question": question,
+        })
+    except QueueFullError as e:
+        os.remove(upload["path"])
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return {**job, "audio_id": upload["audio_id"]}
+
+@app.get("/jobs/stats")
+async def job_stats() -> Dict:
+    return audio_jobs.stats()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = audio_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@app.get("/jobs/{job_id}/wait")
+async def wait_for_job(job_id: str, timeout: float = 25):
+    """Long-poll: returns as soon as the job finishes, or its current state after timeout seconds."""
+    timeout = max(0.0, min(timeout, settings.JOB_LONG_POLL_MAX_SECONDS))
+    job = await audio_jobs.wait(job_id, timeout)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
 @app.post("/analyze-text")
 async def analyze_text(request: TextAnalysisRequest):
     logger.info(f"Analyzing text: {request.text}")
+    metrics.set_language(request.language or "English")
     try:
-        # Get the audio file path from the temp_audio directory
-        audio_file = None
-        if os.path.exists("temp_audio/question_0.mp4"):
-            audio_file = "temp_audio/question_0.mp4"
+        # Find the recording this answer was transcribed from
+        audio_file = resolve_audio_handle(request.audio_id or request.audio_file)
+        if audio_file:
             logger.info(f"Found audio file: {audio_file}")
         else:
-            logger.warning("Audio file not found in temp_audio directory")
+            logger.warning("No audio file provided for this answer")
 
         feedback = await feedback_processor.analyze_text(
             text=request.text,
             question=request.question,
-            tempFileName=audio_file
+            tempFileName=audio_file,
+            language=request.language or "English"
         )
         
         if 'correctness' in feedback:
             logger.info(f"Correctness score: {feedback['correctness'].get('score', 0)}")
             
-        return feedback
+        return profiler.attach(feedback)
     except Exception as e:
         logger.error(f"Error in analyze_text: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze-text/stream")
+async def analyze_text_stream(request: TextAnalysisRequest):
+    """
+    Streaming variant of /analyze-text as Server-Sent Events.
+    Sends one event per feedback section as soon as it is ready, then a "summary"
+    event with the full /analyze-text response (or an "error" event).
+    """
+    logger.info(f"Streaming analysis for text: {request.text}")
+    metrics.set_language(request.language or "English")
+    audio_file = resolve_audio_handle(request.audio_id or request.audio_file)
+    if not audio_file:
+        logger.warning("No audio file provided for this answer")
+
+    async def events():
+        async for event, data in feedback_processor.analyze_text_stream(
+            text=request.text,
+            question=request.question,
+            tempFileName=audio_file,
+            language=request.language or "English"
+        ):
+            yield f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/analyze-assessment")
+async def analyze_assessment(
+    items: str = Form(...),
+    language: str = Form(default="English"),
+    files: List[UploadFile] = File(default=[])
+):
+    """
+    Score all answers of an assessment in one request.
+    items is a JSON array of {"question": ..., "answer": <transcript>} or
+    {"question": ..., "file": <filename of one of the uploaded files>}; uploaded
+    filenames must be unique so each item refers to exactly one recording.
+    """
+    metrics.set_language(language)
+    try:
+        try:
+            parsed_items = json.loads(items)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="items must be a JSON array")
+        if not isinstance(parsed_items, list) or not parsed_items:
+            raise HTTPException(status_code=400, detail="items must be a non-empty JSON array")
+        if len(parsed_items) > settings.BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.BATCH_MAX_ITEMS} items can be scored per request"
+            )
+
+        # Everything is checked before saving, so a rejected request leaves no uploads behind
+        filenames = [file.filename for file in files]
+        duplicates = sorted({name for name in filenames if filenames.count(name) > 1})
+        if duplicates:
+            raise HTTPException(status_code=400, detail=f"Uploaded filenames must be unique: {', '.join(duplicates)}")
+        for item in parsed_items:
+            if not isinstance(item, dict) or not item.get("question"):
+                raise HTTPException(status_code=400, detail="Every item needs a question")
+            if item.get("file") and item["file"] not in filenames:
+                raise HTTPException(status_code=400, detail=f"No uploaded file named {item['file']}")
+
+        uploads = {}
+        for file in files:
+            uploads[file.filename] = await save_upload(file)
+
+        batch = []
+        for item in parsed_items:
+            entry = {"question": item["question"], "answer": item.get("answer")}
+            if item.get("file"):
+                upload = uploads[item["file"]]
+                entry["audio_path"] = upload["path"]
+                entry["audio_hash"] = upload["sha256"]
+            batch.append(entry)
+
+        return await score_assessment(batch, language, feedback_processor)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in analyze_assessment: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/check-answer")
 async def check_answer(data: Dict = Body(...)):
     try:
@@ -132,7 +371,7 @@ async def check_answer(data: Dict = Body(...)):
             )
             
         # Check answer correctness and get feedback
-        result = check_answer_correctness(question, answer)
+        result = await check_answer_correctness(question, answer)
         return result
         
     except Exception as e:
@@ -143,10 +382,17 @@ async def check_answer(data: Dict = Body(...)):
         )
 
 @app.post("/generate-questions")
-async def generate_questions(setup_data: Dict = Body(...)) -> Dict[str, List[str]]:
+async def generate_questions(
+    setup_data: Dict = Body(...),
+    x_user_email: Optional[str] = Header(None)
+) -> Dict:
+    metrics.set_language(setup_data.get("language", "English"))
     try:
-        questions = await generate_assessment_questions(setup_data)
-        return {"questions": questions}
+        if settings.QUESTION_POOL_ENABLED:
+            questions = await question_pool.get_questions(AssessmentSetup(**setup_data), user=x_user_email)
+        else:
+            questions = await generate_assessment_questions(setup_data)
+        return profiler.attach({"questions": questions})
         
     except Exception as e:
         logger.error(f"Error generating questions: {str(e)}")
@@ -178,4 +424,25 @@ async def get_ideal_answer(data: Dict = Body(...)):
             detail=f"Failed to generate ideal answer: {str(e)}"
         )
 
-app.include_router(users.router, prefix="/api/users", tags=["users"])
\ No newline at end of file
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until startup warmup has finished, with import and warmup timings."""
+    return JSONResponse(status_code=200 if warmup.readiness.ready else 503, content=warmup.readiness.status())
+
+@app.get("/metrics")
+async def get_metrics():
+    """Request and per-stage latency histograms and counters in the Prometheus text format."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/cache/stats")
+async def cache_stats() -> Dict:
+    return {
+        "llm": llm_cache.stats(),
+        "transcription": transcription_cache.stats(),
+        "question_pool": question_pool.stats(),
+        "grammar_batch": feedback_processor.grammar_batcher.stats()
+    }
+
+app.include_router(users.router, prefix="/api/users", tags=["users"])
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
\ No newline at end of file
@@ -0,0 +1,206 @@
+import time
+import asyncio
+import logging
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+import profiler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond CPU stages up to slow LLM and transcription calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Per-request labels, set by the HTTP middleware and filled in by handlers. It holds a
+# mutable dict so values set inside the endpoint are visible to the middleware.
+_request_labels: ContextVar[Optional[Dict]] = ContextVar("request_labels", default=None)
+_known_languages: set = set()
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str], buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str]) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str], buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.histogram(
+    "grammologue_request_duration_seconds", "Whole-request latency by endpoint.",
+    ["endpoint", "method", "language", "outcome"]
+)
+REQUESTS_TOTAL = registry.counter(
+    "grammologue_requests_total", "Requests by endpoint and outcome.",
+    ["endpoint", "method", "language", "outcome"]
+)
+STAGE_SECONDS = registry.histogram(
+    "grammologue_stage_duration_seconds", "Latency of one processing stage (decode, pause detection, LLM calls, transcription, Mongo).",
+    ["endpoint", "stage", "model", "language", "outcome"]
+)
+STAGE_TOTAL = registry.counter(
+    "grammologue_stage_calls_total", "Processing stage calls by outcome.",
+    ["endpoint", "stage", "model", "language", "outcome"]
+)
+
+def configure_languages(languages: Iterable[str]) -> None:
+    """Languages reported as-is in the language label; anything else is reported as "other"."""
+    _known_languages.update(languages)
+
+def start_request(scope: Dict) -> Dict:
+    labels = {"scope": scope, "language": ""}
+    _request_labels.set(labels)
+    return labels
+
+def set_language(language: Optional[str]) -> None:
+    """Attach the request's language to its request and stage metrics."""
+    labels = _request_labels.get()
+    if labels is not None and language:
+        labels["language"] = language if language in _known_languages else "other"
+
+def endpoint_label(labels: Optional[Dict]) -> str:
+    # The route template, not the raw path, so ids in URLs do not create new series
+    if labels is None:
+        return ""
+    route = labels["scope"].get("route")
+    return getattr(route, "path", "unmatched")
+
+def observe_request(labels: Dict, method: str, status_code: int, seconds: float) -> None:
+    values = {
+        "endpoint": endpoint_label(labels),
+        "method": method,
+        "language": labels["language"],
+        "outcome": f"{status_code // 100}xx",
+    }
+    REQUEST_SECONDS.observe(seconds, **values)
+    REQUESTS_TOTAL.inc(**values)
+
+def observe_stage(stage: str, seconds: float, outcome: str = "success", model: str = "") -> None:
+    labels = _request_labels.get()
+    values = {
+        "endpoint": endpoint_label(labels),
+        "stage": stage,
+        "model": model or "",
+        "language": labels["language"] if labels else "",
+        "outcome": outcome,
+    }
+    STAGE_SECONDS.observe(seconds, **values)
+    STAGE_TOTAL.inc(**values)
+
+class track_stage:
+    """
+    Time a block as one stage, as a sync or async context manager:
+
+        async with track_stage("grammar", model=model):
+            ...
+
+    The outcome label is "success", "error" if the block raised, or "cancelled". When the
+    request is being profiled, the block is also recorded as a span of its timing tree.
+    """
+
+    __slots__ = ("stage", "model", "started", "span")
+
+    def __init__(self, stage: str, model: str = ""):
+        self.stage = stage
+        self.model = model
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.span = profiler.enter_span(self.stage)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            outcome = "success"
+        elif issubclass(exc_type, asyncio.CancelledError):
+            outcome = "cancelled"
+        else:
+            outcome = "error"
+        observe_stage(self.stage, time.perf_counter() - self.started, outcome, self.model)
+        if self.span is not None:
+            profiler.exit_span(self.span, outcome=outcome, **({"model": self.model} if self.model else {}))
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
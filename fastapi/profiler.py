@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import uuid
+import logging
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class Span:
+    """One timed stage of a profiled request, with its nested stages and annotations."""
+
+    __slots__ = ("name", "started", "cpu_started", "wall_s", "cpu_s", "attributes", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self.wall_s: Optional[float] = None
+        self.cpu_s: Optional[float] = None
+        self.attributes: Dict = {}
+        self.children: List["Span"] = []
+
+    def finish(self) -> None:
+        self.wall_s = time.perf_counter() - self.started
+        self.cpu_s = time.process_time() - self.cpu_started
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict:
+        origin = self.started if origin is None else origin
+        running = self.wall_s is None
+        return {
+            "name": self.name,
+            "start_s": round(self.started - origin, 6),
+            "wall_s": round(time.perf_counter() - self.started if running else self.wall_s, 6),
+            "cpu_s": round(time.process_time() - self.cpu_started if running else self.cpu_s, 6),
+            **({"running": True} if running else {}),
+            **self.attributes,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+# Innermost open span of the current request; None when the request is not profiled.
+# Tasks copy the context when created, so stages started in them nest under the span
+# that was open at that point.
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_profile: ContextVar[Optional[Span]] = ContextVar("profile", default=None)
+
+def start_profile(name: str) -> Span:
+    """Profile the rest of the current request: stages started from here nest under the returned root."""
+    root = Span(name)
+    _profile.set(root)
+    _current_span.set(root)
+    return root
+
+def attach(result: Dict) -> Dict:
+    """Add the timing tree of a profiled request to its response body; unchanged otherwise."""
+    root = _profile.get()
+    if root is None or not isinstance(result, dict):
+        return result
+    return {**result, "profile": root.to_dict()}
+
+def enter_span(name: str):
+    """Open a child of the current span. Returns a token for exit_span, or None when not profiling."""
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    span = Span(name)
+    parent.children.append(span)
+    return span, _current_span.set(span)
+
+def exit_span(token, **attributes) -> None:
+    if token is None:
+        return
+    span, context_token = token
+    span.attributes.update(attributes)
+    span.finish()
+    try:
+        _current_span.reset(context_token)
+    except ValueError:
+        # Exited from a different context than it was entered in
+        _current_span.set(None)
+
+def annotate(**attributes) -> None:
+    """Attach values (bytes decoded, tokens, ...) to the current span; no-op when not profiling."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes.update(attributes)
+
+class StackSampler:
+    """
+    Sampling profiler writing folded stacks ("frame;frame;frame count" per line), the
+    input format of flamegraph.pl, speedscope and similar tools.
+
+    Samples every thread except its own, so work of other requests running at the same
+    time shows up too.
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if thread_id not in names:
+                    names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                thread_name = names.get(thread_id) or str(thread_id)
+                self.samples[";".join([thread_name] + stack[::-1])] += 1
+
+    def stop(self) -> int:
+        """Stop sampling and write the folded stacks. Returns the number of samples."""
+        self._stop.set()
+        self._thread.join()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return sum(self.samples.values())
+
+def new_sample_path(directory: str) -> str:
+    return os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.folded")
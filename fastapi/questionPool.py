@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from config import settings
+from setupGeneration import AssessmentSetup, request_questions, get_fallback_questions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str, str]
+
+def pool_key(setup: AssessmentSetup) -> PoolKey:
+    """Questions are interchangeable between setups that share type, topic, difficulty and language."""
+    return (
+        setup.questionType.strip().lower(),
+        " ".join(setup.topic.split()).lower(),
+        setup.difficulty.strip().lower(),
+        setup.language.strip(),
+    )
+
+class QuestionPool:
+    """
+    Pre-generated assessment questions per pool key.
+
+    Requests are served from stock; when a key's stock drops below the low-water mark a
+    background LLM call refills it. A request the stock cannot cover generates only the
+    questions it is missing and leaves the refill to the background, so a cold key is no
+    slower than generating directly. Questions already served to a user are skipped for
+    that user, and the fallback bank is only used when the pool and the LLM both come up short.
+    """
+
+    def __init__(
+        self,
+        low_water: int = settings.QUESTION_POOL_LOW_WATER,
+        refill_batch: int = settings.QUESTION_POOL_REFILL_BATCH,
+        max_stock: int = settings.QUESTION_POOL_MAX_STOCK,
+        max_keys: int = settings.QUESTION_POOL_MAX_KEYS,
+        history_size: int = settings.QUESTION_POOL_HISTORY_SIZE,
+        max_histories: int = settings.QUESTION_POOL_MAX_HISTORIES,
+    ):
+        self.low_water = low_water
+        self.refill_batch = refill_batch
+        self.max_stock = max_stock
+        self.max_keys = max_keys
+        self.history_size = history_size
+        self.max_histories = max_histories
+        self._stock: "OrderedDict[PoolKey, Deque[str]]" = OrderedDict()
+        self._setups: Dict[PoolKey, AssessmentSetup] = {}
+        self._history: "OrderedDict[Tuple[str, PoolKey], Deque[str]]" = OrderedDict()
+        self._refills: Dict[PoolKey, asyncio.Task] = {}
+        self._stats = {"served_from_pool": 0, "served_from_llm": 0, "served_from_fallback": 0, "refills": 0, "refill_errors": 0}
+
+    def _stock_for(self, key: PoolKey, setup: AssessmentSetup) -> Deque[str]:
+        if key in self._stock:
+            self._stock.move_to_end(key)
+        else:
+            self._stock[key] = deque()
+            while len(self._stock) > self.max_keys:
+                evicted, _ = self._stock.popitem(last=False)
+                self._setups.pop(evicted, None)
+        self._setups[key] = setup
+        return self._stock[key]
+
+    def _seen(self, user: Optional[str], key: PoolKey) -> Deque[str]:
+        if not user:
+            return deque()
+        history_key = (user, key)
+        if history_key in self._history:
+            self._history.move_to_end(history_key)
+        else:
+            self._history[history_key] = deque(maxlen=self.history_size)
+            while len(self._history) > self.max_histories:
+                self._history.popitem(last=False)
+        return self._history[history_key]
+
+    def _take(self, stock: Deque[str], count: int, exclude: Set[str]) -> List[str]:
+        """Remove up to count questions from stock that are not in exclude."""
+        taken = []
+        kept = deque()
+        while stock and len(taken) < count:
+            question = stock.popleft()
+            if question in exclude:
+                kept.append(question)
+            else:
+                taken.append(question)
+                exclude.add(question)
+        # Questions this user has already seen stay in stock for other users
+        stock.extendleft(reversed(kept))
+        return taken
+
+    async def _refill(self, key: PoolKey) -> int:
+        setup = self._setups.get(key)
+        stock = self._stock.get(key)
+        if setup is None or stock is None:
+            return 0
+        try:
+            batch = max(self.refill_batch, setup.numberOfQuestions)
+            questions = await request_questions(setup.copy(update={"numberOfQuestions": batch}))
+        except Exception as e:
+            self._stats["refill_errors"] += 1
+            logger.error(f"Error refilling question pool for {key}: {str(e)}")
+            return 0
+
+        existing = set(stock)
+        added = 0
+        for question in questions:
+            if question not in existing and len(stock) < self.max_stock:
+                stock.append(question)
+                existing.add(question)
+                added += 1
+        self._stats["refills"] += 1
+        logger.info(f"Refilled question pool for {key} with {added} questions ({len(stock)} in stock)")
+        return added
+
+    async def _generate(self, setup: AssessmentSetup, count: int, exclude: Set[str]) -> Optional[List[str]]:
+        """Ask the LLM for just count questions not in exclude; None if the call fails."""
+        try:
+            questions = await request_questions(setup.copy(update={"numberOfQuestions": count}))
+        except Exception as e:
+            logger.error(f"Error generating questions for {pool_key(setup)}: {str(e)}")
+            return None
+        fresh = []
+        for question in questions:
+            if question not in exclude and len(fresh) < count:
+                fresh.append(question)
+                exclude.add(question)
+        return fresh
+
+    def _start_refill(self, key: PoolKey) -> asyncio.Task:
+        task = self._refills.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refill(key))
+            self._refills[key] = task
+            task.add_done_callback(lambda _: self._refills.pop(key, None))
+        return task
+
+    async def get_questions(self, setup: AssessmentSetup, user: Optional[str] = None) -> List[str]:
+        """
+        Get setup.numberOfQuestions questions for an assessment.
+
+        Args:
+            setup (AssessmentSetup): Requested question type, count, topic, difficulty and language
+            user (Optional[str]): Identifier of the user, used to avoid repeating questions
+
+        Returns:
+            List[str]: The questions, from stock where possible
+        """
+        key = pool_key(setup)
+        stock = self._stock_for(key, setup)
+        seen = self._seen(user, key)
+        exclude = set(seen)
+        count = setup.numberOfQuestions
+
+        questions = self._take(stock, count, exclude)
+        self._stats["served_from_pool"] += len(questions)
+
+        # Set when the LLM just came up short, so the refill is not retried until the next request
+        llm_short = False
+        missing = count - len(questions)
+        if missing:
+            refill = self._refills.get(key)
+            if refill is not None:
+                # Already generating for this key: wait for that call rather than making another
+                await asyncio.shield(refill)
+                fresh = self._take(stock, missing, exclude)
+            else:
+                # Cold or exhausted key: generate only what this request needs
+                fresh = await self._generate(setup, missing, exclude)
+            llm_short = fresh is None or len(fresh) < missing
+            fresh = fresh or []
+            self._stats["served_from_llm"] += len(fresh)
+            questions.extend(fresh)
+
+        if len(questions) < count:
+            logger.warning(f"Question pool and LLM unavailable for {key}, using fallback questions")
+            bank = get_fallback_questions(len(exclude) + count, setup.language)
+            # Unseen fallback questions first, then repeats rather than a short assessment
+            ordered = [q for q in bank if q not in exclude] + [q for q in bank if q in exclude and q not in questions]
+            fallback = ordered[:count - len(questions)]
+            self._stats["served_from_fallback"] += len(fallback)
+            questions.extend(fallback)
+
+        seen.extend(questions)
+        if len(stock) < self.low_water and not llm_short:
+            self._start_refill(key)
+        return questions
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "keys": len(self._stock),
+            "stock": sum(len(stock) for stock in self._stock.values()),
+            "refills_in_flight": len(self._refills),
+        }
+
+question_pool = QuestionPool()
@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def normalize_text(text: Optional[str]) -> str:
+    """Normalize input text so trivially different requests share a cache entry."""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", str(text)).split())
+
+def make_key(task: str, model: str, template_version: str, *inputs: Optional[str]) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        task (str): Call site name (grammar, correctness, ...)
+        model (str): Model the prompt is sent to
+        template_version (str): Version of the prompt template
+        *inputs (str): Request inputs, normalized before hashing
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps([task, model, template_version, *[normalize_text(i) for i in inputs]], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LRUCache:
+    """In-memory LRU cache bounded by entry count and entry age."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache:
+    """On-disk cache tier with TTL and size-based (least recently used) eviction."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed)")
+        self._conn.commit()
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if created + self.ttl_seconds < now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict_to_size()
+            self._conn.commit()
+
+    def purge_expired(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+
+    def _evict_to_size(self) -> None:
+        """Drop least recently used entries until the tier fits in max_bytes (caller holds the lock)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        logger.info(f"Evicted {len(victims)} entries from {self.path}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM responses.
+    Values are stored as JSON text, so every hit returns a fresh copy.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None, enabled: bool = True):
+        self.memory = memory
+        self.disk = disk
+        self.enabled = enabled
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.writes = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits_memory += 1
+            return json.loads(value)
+
+        if self.disk is not None:
+            try:
+                value = await asyncio.to_thread(self.disk.get, key)
+            except Exception as e:
+                logger.error(f"Error reading disk cache: {e}")
+                value = None
+            if value is not None:
+                self.hits_disk += 1
+                self.memory.set(key, value)
+                return json.loads(value)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        serialized = json.dumps(value, ensure_ascii=False)
+        self.memory.set(key, serialized)
+        self.writes += 1
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, serialized)
+            except Exception as e:
+                logger.error(f"Error writing disk cache: {e}")
+
+    def stats(self) -> Dict:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_ratio": round((self.hits_memory + self.hits_disk) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_enabled": self.disk is not None,
+        }
+
+def _create_llm_cache() -> ResponseCache:
+    disk = None
+    if settings.LLM_CACHE_ENABLED and settings.LLM_CACHE_SQLITE_PATH:
+        try:
+            disk = SQLiteCache(
+                settings.LLM_CACHE_SQLITE_PATH,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                max_bytes=settings.LLM_CACHE_SQLITE_MAX_BYTES,
+            )
+        except Exception as e:
+            logger.error(f"Disk cache disabled, could not open {settings.LLM_CACHE_SQLITE_PATH}: {e}")
+    return ResponseCache(
+        LRUCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS),
+        disk=disk,
+        enabled=settings.LLM_CACHE_ENABLED,
+    )
+
+# Shared cache for grammar, correctness and ideal-answer responses
+llm_cache = _create_llm_cache()
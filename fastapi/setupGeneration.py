@@ -1,9 +1,8 @@
 import os
 import json
 import logging
-from turtle import setup
 from typing import Dict, List
-from groq import Groq
+from llmClient import chat_completion
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
@@ -60,8 +59,8 @@ def generate_prompt(setup: AssessmentSetup) -> str:
 
     Only include the numbered questions, one per line. No additional text or formatting."""
 
-def extract_questions_from_text(text: str, num_questions: int) -> List[str]:
-    """Extract questions from text response, handling different formats."""
+def parse_questions(text: str) -> List[str]:
+    """Parse every question out of a text response, handling different formats."""
     # Remove any markdown formatting
     clean_text = text.replace("```", "").strip()
     
@@ -89,52 +88,58 @@ def extract_questions_from_text(text: str, num_questions: int) -> List[str]:
             if cleaned:
                 questions.append(cleaned)
     
-    # Ensure we have exactly the number of questions requested
-    questions = questions[:num_questions]
+    return questions
+
+def extract_questions_from_text(text: str, num_questions: int, language: str = "English") -> List[str]:
+    """Extract exactly num_questions questions, padding with the fallback question if needed."""
+    questions = parse_questions(text)[:num_questions]
     while len(questions) < num_questions:
-        questions.append(get_fallback_question(setup.language))
+        questions.append(get_fallback_question(language))
     
     return questions
 
-def generate_questions(setup: AssessmentSetup) -> List[str]:
-    client = Groq(
-        api_key="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",
-    )
+async def request_questions(setup: AssessmentSetup) -> List[str]:
+    """
+    Ask the LLM for setup.numberOfQuestions questions.
 
+    Returns:
+        List[str]: the questions parsed from the response, without fallback padding.
+        Errors from the LLM call are raised to the caller.
+    """
     prompt = generate_prompt(setup)
-    logger.warning("before try")
+    response_content = await chat_completion(
+        "questions",
+        messages=[
+            {
+                "role": "system",
+                "content": f"""You are an expert {setup.language} language assessment creator. 
+                Generate questions that are clear, engaging, and appropriate for the specified level.
+                All questions must be in {setup.language}.
+                Each question should be on a new line and numbered.
+                Do not include any additional text or formatting."""
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+    )
+    
+    logger.info(response_content)
+    return parse_questions(response_content)[:setup.numberOfQuestions]
+
+async def generate_questions(setup: AssessmentSetup) -> List[str]:
     try:
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"""You are an expert {setup.language} language assessment creator. 
-                    Generate questions that are clear, engaging, and appropriate for the specified level.
-                    All questions must be in {setup.language}.
-                    Each question should be on a new line and numbered.
-                    Do not include any additional text or formatting."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model="meta-llama/llama-4-scout-17b-16e-instruct",
-            temperature=0.7,
-            max_tokens=2000,
-            top_p=1,
-            stream=False
-        )
-        
-        response_content = chat_completion.choices[0].message.content
-        logger.info(response_content)
-        # Extract questions from the response
-        questions = extract_questions_from_text(response_content, setup.numberOfQuestions)
+        questions = await request_questions(setup)
         
         if not questions:
             logger.warning("No questions extracted, using fallback questions")
             return get_fallback_questions(setup.numberOfQuestions, setup.language)
         
+        # Ensure we have exactly the number of questions requested
+        while len(questions) < setup.numberOfQuestions:
+            questions.append(get_fallback_question(setup.language))
+        
         return questions
             
     except Exception as e:
@@ -243,6 +248,6 @@ async def generate_assessment_questions(setup: Dict) -> List[str]:
     Main function to generate assessment questions based on setup parameters.
     """
     assessment_setup = AssessmentSetup(**setup)
-    questions = generate_questions(assessment_setup)
+    questions = await generate_questions(assessment_setup)
     
     return questions
\ No newline at end of file
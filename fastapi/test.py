@@ -1,6 +1,7 @@
 import librosa
 import numpy as np
 import soundfile as sf
+from feedback.get_pause import find_silent_runs
 
 def detect_pauses(audio_path, threshold_seconds=2, amplitude_threshold=0.01):
     """
@@ -27,38 +28,11 @@ def detect_pauses(audio_path, threshold_seconds=2, amplitude_threshold=0.01):
     times = librosa.times_like(audio_envelope, sr=sample_rate, hop_length=hop_length)
     
     # Detect periods of silence
-    pauses = []
-    in_pause = False
-    pause_start = 0
-    
-    for i in range(len(audio_envelope)):
-        # Check if current segment is below amplitude threshold
-        if audio_envelope[i] < amplitude_threshold:
-            if not in_pause:
-                # Start of a pause
-                pause_start = times[i]
-                in_pause = True
-        else:
-            if in_pause:
-                # End of a pause
-                pause_duration = times[i] - pause_start
-                if pause_duration >= threshold_seconds:
-                    pauses.append({
-                        'start': pause_start,
-                        'end': times[i],
-                        'duration': pause_duration
-                    })
-                in_pause = False
-    
-    # If the audio ends while in a pause
-    if in_pause:
-        pause_duration = times[-1] - pause_start
-        if pause_duration >= threshold_seconds:
-            pauses.append({
-                'start': pause_start,
-                'end': times[-1],
-                'duration': pause_duration
-            })
+    start_times, end_times, durations = find_silent_runs(audio_envelope, times, amplitude_threshold, threshold_seconds)
+    pauses = [
+        {'start': start, 'end': end, 'duration': duration}
+        for start, end, duration in zip(start_times, end_times, durations)
+    ]
     
     return {
         'total_pauses': len(pauses),
@@ -0,0 +1,60 @@
+import json
+from feedback.combined_analysis import _extract_json, split_combined_response
+
+IDEAL = {"ideal_answer": "A model answer.", "user_strengths": ["clear"], "areas_for_improvement": ["detail"]}
+
+def _combined(**overrides):
+    data = {
+        "grammar": {"error_count": 1, "errors": [{"error": "he go", "correction": "he goes"}]},
+        "correctness": {"relevance_score": 40, "quality_score": 35, "feedback": "Good", "suggestions": "More examples", "remark": "Fine"},
+        "ideal_answer": IDEAL,
+    }
+    data.update(overrides)
+    return data
+
+def test_extract_json_tolerates_fences_and_surrounding_text():
+    payload = {"grammar": {"error_count": 0}}
+    assert _extract_json(json.dumps(payload)) == payload
+    assert _extract_json("```json\n" + json.dumps(payload) + "\n```") == payload
+    assert _extract_json("Here is the analysis: " + json.dumps(payload) + " Hope this helps!") == payload
+
+def test_extract_json_normalizes_unicode():
+    # Full-width braces and quotes, as some models return them
+    assert _extract_json("｛＂score＂: 1｝") == {"score": 1}
+
+def test_extract_json_rejects_non_objects():
+    assert _extract_json("") is None
+    assert _extract_json("no json here") is None
+    assert _extract_json("{not valid json}") is None
+    assert _extract_json("} {") is None
+    assert _extract_json("[1, 2]") is None
+
+def test_split_combined_response_shapes_sections():
+    result = split_combined_response(_combined())
+    assert result["grammar"] == {"error_count": 1, "errors": [{"error": "he go", "correction": "he goes"}]}
+    assert result["correctness"] == {
+        "score": 75, "relevance_score": 40, "quality_score": 35,
+        "feedback": "Good", "suggestions": "More examples", "remark": "Fine",
+    }
+    assert result["ideal_answer"] == {"status": "success", "data": IDEAL}
+
+def test_split_combined_response_defaults_missing_fields():
+    result = split_combined_response(_combined(grammar={}, correctness={}))
+    assert result["grammar"] == {"error_count": 0, "errors": []}
+    assert result["correctness"]["score"] == 0
+    assert result["correctness"]["feedback"] == ""
+
+def test_split_combined_response_requires_every_section():
+    assert split_combined_response(_combined(grammar=None)) is None
+    assert split_combined_response(_combined(correctness="good")) is None
+    assert split_combined_response(_combined(ideal_answer={"ideal_answer": "only this"})) is None
+    assert split_combined_response({}) is None
+
+if __name__ == "__main__":
+    test_extract_json_tolerates_fences_and_surrounding_text()
+    test_extract_json_normalizes_unicode()
+    test_extract_json_rejects_non_objects()
+    test_split_combined_response_shapes_sections()
+    test_split_combined_response_defaults_missing_fields()
+    test_split_combined_response_requires_every_section()
+    print("Combined response parsing behaves as expected")
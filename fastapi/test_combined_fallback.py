@@ -0,0 +1,65 @@
+import time
+import json
+import asyncio
+import pytest
+import responseCache
+from feedback import check_correctness, combined_analysis, feedback_processor
+from feedback.feedback_processor import FeedbackProcessor
+
+QUESTION = "Why do people learn new skills?"
+ANSWER = "I think people want to learn new skills because technology helps them do it faster."
+CORRECTNESS = {"relevance_score": 40, "quality_score": 30, "feedback": "Good", "suggestions": "", "remark": ""}
+
+class FakeLLM:
+    """Stands in for chat_completion at every call site and records the task of each call."""
+
+    def __init__(self, combined_delay: float = 0.0):
+        self.tasks = []
+        self.combined_delay = combined_delay
+
+    async def __call__(self, task, messages, **overrides):
+        self.tasks.append(task)
+        if task == "combined":
+            await asyncio.sleep(self.combined_delay)
+            return "not json at all"
+        if task == "correctness":
+            return json.dumps(CORRECTNESS)
+        return json.dumps({"error_count": 0, "errors": []})
+
+@pytest.fixture
+def combined_mode(monkeypatch):
+    def install(llm: FakeLLM) -> FakeLLM:
+        for module in (check_correctness, combined_analysis, feedback_processor):
+            monkeypatch.setattr(module, "chat_completion", llm)
+        return llm
+
+    monkeypatch.setattr(check_correctness, "LLM_COMBINED_MODE", True)
+    monkeypatch.setattr(feedback_processor, "LLM_COMBINED_MODE", True)
+    monkeypatch.setattr(feedback_processor, "ANALYSIS_TIMEOUT_SECONDS", 1.0)
+    monkeypatch.setattr(responseCache.llm_cache, "enabled", False)
+    return install
+
+def _analyze():
+    started = time.perf_counter()
+    feedback = asyncio.run(FeedbackProcessor().analyze_text(ANSWER, QUESTION))
+    return feedback, time.perf_counter() - started
+
+def test_unparseable_combined_response_falls_back_to_separate_calls_once(combined_mode):
+    llm = combined_mode(FakeLLM())
+
+    feedback, elapsed = _analyze()
+
+    assert llm.tasks[0] == "combined"
+    assert sorted(llm.tasks[1:]) == ["correctness", "grammar"]
+    assert feedback["correctness"]["score"] == 70
+    assert elapsed < 1.0
+
+def test_combined_timeout_keeps_the_overall_deadline(combined_mode):
+    llm = combined_mode(FakeLLM(combined_delay=5))
+
+    feedback, elapsed = _analyze()
+
+    # The fallback only gets what is left of the deadline, which is nothing
+    assert llm.tasks == ["combined"]
+    assert 1.0 <= elapsed < 1.5
+    assert "error" in feedback["correctness"]
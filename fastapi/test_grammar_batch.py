@@ -0,0 +1,93 @@
+import json
+import asyncio
+from feedback import grammar_batch
+from feedback.grammar_batch import GrammarBatcher, build_batch_input, split_batch_response
+
+def _entry(id, errors):
+    return {"id": id, "error_count": len(errors), "errors": errors}
+
+def test_split_batch_response_orders_results_by_id():
+    response = "```json\n" + json.dumps({"results": [_entry(2, ["b"]), _entry(1, [])]}) + "\n```"
+    assert split_batch_response(response, 2) == [
+        {"error_count": 0, "errors": []},
+        {"error_count": 1, "errors": ["b"]},
+    ]
+
+def test_split_batch_response_leaves_bad_entries_for_single_calls():
+    response = json.dumps({"results": [
+        _entry(1, ["a"]),
+        _entry(1, ["duplicate"]),           # first entry for an id wins
+        {"id": "x", "errors": []},          # unusable id
+        {"id": 3, "errors": "not a list"},  # malformed errors
+        _entry(9, []),                      # out of range
+    ]})
+    assert split_batch_response(response, 3) == [{"error_count": 1, "errors": ["a"]}, None, None]
+
+def test_split_batch_response_without_json():
+    assert split_batch_response("Sorry, I cannot help with that.", 2) == [None, None]
+    assert split_batch_response(None, 1) == [None]
+    assert split_batch_response(json.dumps({"results": "none"}), 1) == [None]
+
+def test_build_batch_input_numbers_texts():
+    assert build_batch_input(["first", "second"]) == "[TEXT 1]\nfirst\n[END 1]\n\n[TEXT 2]\nsecond\n[END 2]"
+
+def _batcher(monkeypatch, batch_response):
+    batch_calls, single_calls = [], []
+
+    async def fake_chat_completion(task, messages, **overrides):
+        batch_calls.append(messages[1]["content"])
+        if isinstance(batch_response, Exception):
+            raise batch_response
+        return batch_response
+
+    async def single_call(text):
+        single_calls.append(text)
+        return f"single:{text}"
+
+    monkeypatch.setattr(grammar_batch, "chat_completion", fake_chat_completion)
+    return GrammarBatcher("prompt", single_call, window_seconds=0.01, max_items=8), batch_calls, single_calls
+
+def test_concurrent_requests_share_one_call(monkeypatch):
+    response = json.dumps({"results": [_entry(1, []), _entry(2, ["e"])]})
+    batcher, batch_calls, single_calls = _batcher(monkeypatch, response)
+
+    async def scenario():
+        return await asyncio.gather(batcher.analyze("one"), batcher.analyze("two"))
+    results = asyncio.run(scenario())
+
+    assert results == [{"error_count": 0, "errors": []}, {"error_count": 1, "errors": ["e"]}]
+    assert len(batch_calls) == 1 and single_calls == []
+    assert batcher.stats()["batched_items"] == 2
+
+def test_missing_results_and_lone_requests_use_single_calls(monkeypatch):
+    batcher, batch_calls, single_calls = _batcher(monkeypatch, json.dumps({"results": [_entry(1, [])]}))
+
+    async def scenario():
+        both = await asyncio.gather(batcher.analyze("one"), batcher.analyze("two"))
+        alone = await batcher.analyze("three")
+        return both, alone
+    both, alone = asyncio.run(scenario())
+
+    assert both == [{"error_count": 0, "errors": []}, "single:two"]
+    assert alone == "single:three"
+    assert len(batch_calls) == 1 and single_calls == ["two", "three"]
+    assert batcher.stats()["fallbacks"] == 1
+
+def test_failed_batch_call_falls_back(monkeypatch):
+    batcher, _, single_calls = _batcher(monkeypatch, RuntimeError("provider down"))
+
+    async def scenario():
+        return await asyncio.gather(batcher.analyze("one"), batcher.analyze("two"))
+    assert asyncio.run(scenario()) == ["single:one", "single:two"]
+    assert single_calls == ["one", "two"]
+
+def test_full_batch_is_sent_without_waiting(monkeypatch):
+    response = json.dumps({"results": [_entry(1, []), _entry(2, [])]})
+    batcher, batch_calls, _ = _batcher(monkeypatch, response)
+    batcher.window_seconds = 60
+    batcher.max_items = 2
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(batcher.analyze("one"), batcher.analyze("two")), timeout=1)
+    assert len(asyncio.run(scenario())) == 2
+    assert len(batch_calls) == 1
@@ -0,0 +1,93 @@
+import time
+import asyncio
+import pytest
+from jobQueue import JobQueue, QueueFullError, JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED
+
+def _blocking_handler(release: asyncio.Event):
+    async def handler(payload):
+        await release.wait()
+        if payload.get("fail"):
+            raise ValueError("handler failed")
+        return {"echo": payload["value"]}
+    return handler
+
+def test_submit_rejects_when_queue_is_full():
+    async def scenario():
+        queue = JobQueue(_blocking_handler(asyncio.Event()), concurrency=1, max_queued=2)
+        # No await between submits, so the worker has not taken any job yet
+        first = queue.submit({"value": 1})
+        queue.submit({"value": 2})
+        with pytest.raises(QueueFullError):
+            queue.submit({"value": 3})
+        assert first["status"] == JOB_QUEUED
+        assert queue.stats()["queue_length"] == 2
+        await queue.stop()
+        assert queue.get(first["job_id"])["status"] == JOB_FAILED
+    asyncio.run(scenario())
+
+def test_finished_jobs_expire_after_ttl():
+    async def scenario():
+        release = asyncio.Event()
+        release.set()
+        queue = JobQueue(_blocking_handler(release), concurrency=1, max_queued=4, ttl_seconds=0.05)
+        job = queue.submit({"value": 7})
+        done = await queue.wait(job["job_id"], timeout=1)
+        assert done["status"] == JOB_DONE
+        assert done["result"] == {"echo": 7}
+        await asyncio.sleep(0.1)
+        assert queue.get(job["job_id"]) is None
+        assert await queue.wait(job["job_id"], timeout=0) is None
+        await queue.stop()
+    asyncio.run(scenario())
+
+def test_running_jobs_do_not_expire():
+    async def scenario():
+        release = asyncio.Event()
+        queue = JobQueue(_blocking_handler(release), concurrency=1, max_queued=4, ttl_seconds=0)
+        job = queue.submit({"value": 1})
+        await asyncio.sleep(0.05)
+        assert queue.get(job["job_id"])["status"] == JOB_RUNNING
+        release.set()
+        await queue.stop()
+    asyncio.run(scenario())
+
+def test_wait_returns_current_state_on_timeout_and_early_on_completion():
+    async def scenario():
+        release = asyncio.Event()
+        queue = JobQueue(_blocking_handler(release), concurrency=1, max_queued=4)
+        job = queue.submit({"value": 3})
+
+        started = time.perf_counter()
+        pending = await queue.wait(job["job_id"], timeout=0.1)
+        assert time.perf_counter() - started >= 0.1
+        assert pending["status"] == JOB_RUNNING
+
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        started = time.perf_counter()
+        done = await queue.wait(job["job_id"], timeout=5)
+        assert time.perf_counter() - started < 1
+        assert done["status"] == JOB_DONE
+        assert "payload" not in done and "context" not in done
+        await queue.stop()
+    asyncio.run(scenario())
+
+def test_failed_job_reports_error():
+    async def scenario():
+        release = asyncio.Event()
+        release.set()
+        queue = JobQueue(_blocking_handler(release), concurrency=1, max_queued=4)
+        job = queue.submit({"value": 0, "fail": True})
+        failed = await queue.wait(job["job_id"], timeout=1)
+        assert failed["status"] == JOB_FAILED
+        assert failed["error"] == "handler failed"
+        assert queue.get("unknown") is None
+        await queue.stop()
+    asyncio.run(scenario())
+
+if __name__ == "__main__":
+    test_submit_rejects_when_queue_is_full()
+    test_finished_jobs_expire_after_ttl()
+    test_running_jobs_do_not_expire()
+    test_wait_returns_current_state_on_timeout_and_early_on_completion()
+    test_failed_job_reports_error()
+    print("Job queue behaves as expected")
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import numpy as np
+import soundfile as sf
+import librosa
+from feedback.get_pause import get_pause_count, _detect_pauses_loop, _detect_pauses_vectorized
+
+def _synthetic_speech(sample_rate=16000, seed=0):
+    """Tone bursts separated by silences of varying length, including leading and trailing silence."""
+    rng = np.random.default_rng(seed)
+    segments = [np.zeros(int(0.9 * sample_rate))]
+    for _ in range(12):
+        duration = rng.uniform(0.3, 2.0)
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        segments.append(0.5 * np.sin(2 * np.pi * rng.uniform(120, 300) * t))
+        segments.append(np.zeros(int(rng.uniform(0.1, 1.5) * sample_rate)))
+    segments.append(np.zeros(int(1.2 * sample_rate)))
+    return np.concatenate(segments).astype(np.float32)
+
+def test_detectors_match_on_random_envelopes():
+    rng = np.random.default_rng(42)
+    for _ in range(200):
+        n = int(rng.integers(0, 400))
+        envelope = rng.random(n) * rng.choice([0.02, 0.05, 1.0])
+        times = librosa.frames_to_time(np.arange(n), sr=16000, hop_length=512)
+        threshold_seconds = float(rng.choice([0.0, 0.1, 0.8]))
+        assert _detect_pauses_loop(envelope, times, 0.015, threshold_seconds) == \
+            _detect_pauses_vectorized(envelope, times, 0.015, threshold_seconds)
+
+def test_get_pause_count_matches_on_audio():
+    sample_rate = 16000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "speech.wav")
+        sf.write(path, _synthetic_speech(sample_rate), sample_rate)
+        loop_result = get_pause_count(path, method="loop")
+        vectorized_result = get_pause_count(path, method="vectorized")
+    assert "error" not in loop_result
+    assert loop_result["total_pauses"] > 0
+    assert loop_result == vectorized_result
+
+if __name__ == "__main__":
+    test_detectors_match_on_random_envelopes()
+    test_get_pause_count_matches_on_audio()
+    print("Pause detectors produce identical results")
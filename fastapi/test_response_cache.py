@@ -0,0 +1,107 @@
+import os
+import asyncio
+import tempfile
+import pytest
+import responseCache
+from responseCache import LRUCache, ResponseCache, SQLiteCache, make_key
+
+class FakeClock:
+    """Stands in for the time module inside responseCache."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(responseCache, "time", fake)
+    return fake
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield os.path.join(tmp_dir, "cache", "llm.sqlite3")
+
+def _rows(cache: SQLiteCache):
+    return [key for (key,) in cache._conn.execute("SELECT key FROM entries ORDER BY key")]
+
+def test_sqlite_entries_expire_after_ttl(clock, db_path):
+    cache = SQLiteCache(db_path, ttl_seconds=60, max_bytes=1024)
+    cache.set("a", "value")
+    clock.now += 59
+    assert cache.get("a") == "value"
+    # Reading does not extend the lifetime of an entry
+    clock.now += 2
+    assert cache.get("a") is None
+    assert _rows(cache) == []
+    cache.close()
+
+def test_sqlite_expired_entries_are_purged_on_open(clock, db_path):
+    cache = SQLiteCache(db_path, ttl_seconds=60, max_bytes=1024)
+    cache.set("old", "1")
+    clock.now += 30
+    cache.set("new", "2")
+    cache.close()
+
+    clock.now += 45
+    reopened = SQLiteCache(db_path, ttl_seconds=60, max_bytes=1024)
+    assert _rows(reopened) == ["new"]
+    assert reopened.get("new") == "2"
+    reopened.close()
+
+def test_sqlite_evicts_least_recently_used_to_fit_size(clock, db_path):
+    cache = SQLiteCache(db_path, ttl_seconds=3600, max_bytes=10)
+    cache.set("a", "aaaa")
+    clock.now += 1
+    cache.set("b", "bbbb")
+    clock.now += 1
+    assert cache.get("a") == "aaaa"
+    clock.now += 1
+    cache.set("c", "cccc")
+    assert _rows(cache) == ["a", "c"]
+    assert cache.get("b") is None
+    cache.close()
+
+def test_sqlite_size_counts_encoded_bytes(clock, db_path):
+    cache = SQLiteCache(db_path, ttl_seconds=3600, max_bytes=8)
+    cache.set("a", "éé")  # 4 bytes in UTF-8
+    clock.now += 1
+    cache.set("b", "ééé")  # 6 bytes: over the limit together
+    assert _rows(cache) == ["b"]
+    cache.close()
+
+def test_lru_cache_bounds_entries_and_age(clock):
+    cache = LRUCache(max_entries=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    clock.now += 11
+    assert cache.get("a") is None
+
+def test_response_cache_promotes_disk_hits_and_returns_copies(clock, db_path):
+    disk = SQLiteCache(db_path, ttl_seconds=3600, max_bytes=1024)
+    cache = ResponseCache(LRUCache(10, 3600), disk=disk)
+    key = make_key("grammar", "model", "v1", "Some  Text")
+
+    async def scenario():
+        await cache.set(key, {"errors": ["x"]})
+        cache.memory.clear()
+        first = await cache.get(key)
+        first["errors"].append("mutated")
+        second = await cache.get(key)
+        return first, second
+    first, second = asyncio.run(scenario())
+
+    assert second == {"errors": ["x"]}
+    assert cache.stats()["hits_disk"] == 1 and cache.stats()["hits_memory"] == 1
+    assert make_key("grammar", "model", "v1", " Some Text ") == key
+    disk.close()
@@ -0,0 +1,107 @@
+import os
+import time
+import wave
+import asyncio
+import logging
+import tempfile
+import importlib
+from typing import Dict, Optional
+import numpy as np
+from config import settings
+from feedback import process_pool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Imported on first use by the request path; loaded here in the background instead
+DEFERRED_IMPORTS = ("groq", "motor.motor_asyncio", "pydub")
+
+class Readiness:
+    """Startup state reported by /ready: import time, then each warmup stage and its duration."""
+
+    def __init__(self):
+        self.ready = False
+        self.import_seconds: Optional[float] = None
+        self.stages: Dict[str, Dict] = {}
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def status(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "import_s": self.import_seconds,
+            "warmup_s": round(self.finished - self.started, 3) if self.finished else None,
+            "stages": self.stages,
+        }
+
+readiness = Readiness()
+
+def _synthetic_wav(path: str, sample_rate: int = 44100) -> None:
+    """One second of tone bursts and silence at a typical upload rate, so a configured ANALYSIS_SAMPLE_RATE is resampled to."""
+    t = np.arange(sample_rate) / sample_rate
+    samples = 0.3 * np.sin(2 * np.pi * 220 * t) * (t % 0.5 < 0.25)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes((samples * 32767).astype("<i2").tobytes())
+
+def _import_deferred() -> None:
+    for module in DEFERRED_IMPORTS:
+        importlib.import_module(module)
+
+async def _stage(name: str, coroutine) -> None:
+    started = time.perf_counter()
+    try:
+        await coroutine
+        readiness.stages[name] = {"seconds": round(time.perf_counter() - started, 3)}
+    except Exception as e:
+        # A failed stage only costs the first request its warmup, so still become ready
+        readiness.stages[name] = {"seconds": round(time.perf_counter() - started, 3), "error": str(e)}
+        logger.error(f"Warmup stage {name} failed: {e}")
+    logger.info(f"Warmup stage {name} took {readiness.stages[name]['seconds']:.3f}s")
+
+async def run() -> None:
+    """
+    Run the first-call costs of the request path before traffic arrives: deferred imports,
+    decoding, and librosa's numba-compiled pause detection (in the process pool workers,
+    or in this process when the pool is disabled). /ready reports ready once this finishes.
+    """
+    from feedback.audio_utils import decode_audio
+    from feedback.get_pause import get_pause_count_from_buffer
+
+    readiness.started = time.perf_counter()
+    # Pool workers compile in their own processes, alongside the warmup of this one
+    pool_warmup = None
+    if process_pool.get_executor() is not None:
+        pool_warmup = asyncio.create_task(_stage("pause_detection", process_pool.warm_up()))
+
+    await _stage("imports", asyncio.to_thread(_import_deferred))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "warmup.wav")
+        _synthetic_wav(path)
+        audio = None
+
+        async def decode():
+            nonlocal audio
+            audio = await asyncio.to_thread(decode_audio, path)
+        await _stage("decode", decode())
+
+    if pool_warmup is not None:
+        await pool_warmup
+    elif audio is not None:
+        await _stage("pause_detection", asyncio.to_thread(get_pause_count_from_buffer, audio.samples, audio.sample_rate))
+
+    readiness.finished = time.perf_counter()
+    readiness.ready = True
+    logger.info(f"Warmup finished in {readiness.finished - readiness.started:.3f}s, ready for traffic")
+
+def start(import_seconds: float) -> Optional[asyncio.Task]:
+    """Record the app's import time and start warmup in the background (or become ready at once)."""
+    readiness.import_seconds = round(import_seconds, 3)
+    logger.info(f"Application modules imported in {import_seconds:.3f}s")
+    if not settings.STARTUP_WARMUP_ENABLED:
+        readiness.ready = True
+        return None
+    return asyncio.create_task(run())
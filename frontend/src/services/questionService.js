@@ -10,6 +10,8 @@ export const fetchQuestions = async (setupData) => {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
+      // Lets the question pool avoid repeating questions for the same user
+      'x-user-email': JSON.parse(localStorage.getItem('currUser'))?.email || '',
     },
     body: JSON.stringify(setupData),
   });
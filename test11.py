@@ -9,7 +9,7 @@ def test_groq_api():
     try:
         # Initialize Groq client with your API key
         client = Groq(
-            api_key="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"
+            api_key=os.getenv("GROQ_API_KEY")
         )
 
         # Test prompt